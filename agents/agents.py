@@ -5,17 +5,19 @@ Dify Agent 封装模块
 基于 DifyClient 实现特定业务场景的 Agent，提供可扩展的架构
 """
 
-from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
+import importlib
 import json
 
 from dify.dify_client import DifyClient, DifyAPIError, FileInfo, ResponseMode
 
-# 导入具体的Agent实现
-from agents.content_validator.content_validator_agent import ContentValidatorAgent
-from agents.scenario_generator.scenario_generator_agent import ScenarioGeneratorAgent
+# 具体的Agent实现按需导入（场景生成器会加载商品库及 pandas），见模块末尾的 __getattr__
+_LAZY_AGENTS = {
+    'ContentValidatorAgent': 'agents.content_validator.content_validator_agent',
+    'ScenarioGeneratorAgent': 'agents.scenario_generator.scenario_generator_agent',
+}
 
 
 class AgentType(Enum):
@@ -27,7 +29,7 @@ class AgentType(Enum):
     CUSTOM = "custom"  # 自定义类型
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Agent 配置信息"""
     name: str
@@ -39,7 +41,7 @@ class AgentConfig:
     max_tokens: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Agent 响应结果"""
     success: bool
@@ -49,10 +51,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -67,6 +69,8 @@ class BaseAgent(ABC):
         self.client = dify_client
         self.config = config
         self._validate_config()
+        # 预先拼接系统提示词前缀，避免每次请求重复拼接
+        self._query_prefix = f"{config.system_prompt}\n\n" if config.system_prompt else ""
     
     def _validate_config(self) -> None:
         """验证配置信息"""
@@ -75,9 +79,8 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法
+        """处理请求，子类必须重写
         
         Args:
             params: 包含所有参数的字典，必须包含'query'字段
@@ -88,11 +91,10 @@ class BaseAgent(ABC):
         Returns:
             AgentResponse: 处理结果
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法
+        """流式处理请求，子类必须重写
         
         Args:
             params: 包含所有参数的字典，必须包含'query'字段
@@ -103,27 +105,20 @@ class BaseAgent(ABC):
         Yields:
             AgentResponse: 流式处理结果
         """
-        pass
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        """准备输入参数，合并默认参数和用户参数"""
-        final_inputs = {}
-        
-        # 添加默认参数
-        if self.config.default_inputs:
-            final_inputs.update(self.config.default_inputs)
-        
-        # 添加用户参数（会覆盖默认参数）
-        if inputs:
-            final_inputs.update(inputs)
-        
-        return final_inputs
+        """准备输入参数，合并默认参数和用户参数（用户参数会覆盖默认参数）"""
+        default_inputs = self.config.default_inputs
+        if not default_inputs:
+            return dict(inputs) if inputs else {}
+        if not inputs:
+            return dict(default_inputs)
+        return {**default_inputs, **inputs}
     
     def _build_query(self, query: str, **kwargs) -> str:
         """构建查询字符串，子类可以重写此方法来自定义查询格式"""
-        if self.config.system_prompt:
-            return f"{self.config.system_prompt}\n\n{query}"
-        return query
+        return self._query_prefix + query
     
     def _handle_response(self, raw_response: Dict[str, Any]) -> AgentResponse:
         """处理原始响应，转换为 AgentResponse 格式"""
@@ -132,7 +127,7 @@ class BaseAgent(ABC):
             metadata = {
                 'message_id': raw_response.get('message_id'),
                 'usage': raw_response.get('usage'),
-                'retriever_resources': raw_response.get('retriever_resources', [])
+                'retriever_resources': raw_response.get('retriever_resources', ())
             }
             
             return AgentResponse(
@@ -149,6 +144,15 @@ class BaseAgent(ABC):
                 raw_response=raw_response
             )
     
+    def _handle_stream_chunk(self, chunk: Dict[str, Any]) -> AgentResponse:
+        """处理流式响应块
+        
+        普通文本块只提取内容，不保留原始数据；只有结束块（message_end）携带用量等元数据
+        """
+        if chunk.get('event') == 'message_end':
+            return self._handle_response(chunk)
+        return AgentResponse(success=True, content=chunk.get('answer', ''))
+    
     def get_info(self) -> Dict[str, Any]:
         """获取 Agent 信息"""
         return {
@@ -209,6 +213,7 @@ class AgentManager:
         cache_key = "content_validator"
         
         if cache_key not in self._agents:
+            from agents.content_validator.content_validator_agent import ContentValidatorAgent
             self._agents[cache_key] = ContentValidatorAgent()
         
         return self._agents[cache_key]
@@ -222,6 +227,7 @@ class AgentManager:
         cache_key = "scenario_generator"
         
         if cache_key not in self._agents:
+            from agents.scenario_generator.scenario_generator_agent import ScenarioGeneratorAgent
             self._agents[cache_key] = ScenarioGeneratorAgent(
                 endpoint=self.endpoint,
                 app_key=self.app_key
@@ -271,8 +277,10 @@ class AgentFactory:
             BaseAgent: Agent 实例
         """
         if agent_type == AgentType.CONTENT_VALIDATOR:
+            from agents.content_validator.content_validator_agent import ContentValidatorAgent
             return ContentValidatorAgent()
         elif agent_type == AgentType.SCENARIO_GENERATOR:
+            from agents.scenario_generator.scenario_generator_agent import ScenarioGeneratorAgent
             return ScenarioGeneratorAgent(
                 endpoint=self.endpoint,
                 app_key=self.app_key
@@ -311,4 +319,14 @@ class AgentFactory:
     
     def clear_agents(self) -> None:
         """清空所有 Agent 缓存"""
-        self._agents.clear()
\ No newline at end of file
+        self._agents.clear()
+
+
+def __getattr__(name: str) -> Any:
+    """兼容 `from agents.agents import ContentValidatorAgent` 等旧用法，首次访问时才导入"""
+    module_name = _LAZY_AGENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -5,6 +5,8 @@ ContentGeneratorAgent 测试模块
 测试文案生成器的功能
 """
 
+import sys
+
 from agents.content_generator.content_generator_agent import ContentGeneratorAgent
 
 
@@ -37,11 +39,24 @@ def test_content_generator():
             "scenario_content": "女儿偷吃薯片被发现，需要温和地教育",
             "persona": "养生妈妈，温和耐心，注重家庭和谐"
         }
+        # 流式片段先缓存，遇到换行或累计超过 4KB 再统一写出，减少逐片段 flush
+        buffer = []
+        buffered = 0
         for chunk in generator.process_streaming(params):
             if chunk.success:
-                print(chunk.content, end="", flush=True)
+                buffer.append(chunk.content)
+                buffered += len(chunk.content)
+                if "\n" in chunk.content or buffered >= 4096:
+                    sys.stdout.write("".join(buffer))
+                    sys.stdout.flush()
+                    buffer.clear()
+                    buffered = 0
             else:
+                sys.stdout.write("".join(buffer))
+                buffer.clear()
+                buffered = 0
                 print(f"\n错误: {chunk.error_message}")
+        sys.stdout.write("".join(buffer))
         print("\n")
         
         # 批量生成测试
@@ -5,7 +5,6 @@
 """
 
 from typing import Dict, Any, Optional, List, Iterator
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from dify.dify_client import DifyClient, DifyAPIError
@@ -42,10 +41,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -62,15 +61,13 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法"""
-        pass
+        """处理请求，子类必须重写"""
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法"""
-        pass
+        """流式处理请求，子类必须重写"""
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """准备输入参数，合并默认参数和用户参数"""
@@ -344,13 +341,8 @@ class ContentRewriterAgent(BaseAgent):
         Returns:
             str: 完整的查询字符串
         """
-        query_parts = [
-            f"人设信息：\n{persona}",
-            f"场景信息：\n{scenario}",
-            f"原始文案：\n{text}"
-        ]
-        
+        # 整段使用单个 f-string 拼接（比 str.format / 列表 join 更快）
         if goods:
-            query_parts.insert(-1, f"推荐商品信息：\n{goods}")
+            return f"人设信息：\n{persona}\n\n场景信息：\n{scenario}\n\n推荐商品信息：\n{goods}\n\n原始文案：\n{text}"
         
-        return "\n\n".join(query_parts)
\ No newline at end of file
+        return f"人设信息：\n{persona}\n\n场景信息：\n{scenario}\n\n原始文案：\n{text}"
\ No newline at end of file
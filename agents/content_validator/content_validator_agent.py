@@ -6,10 +6,10 @@
 """
 
 from typing import Dict, Any, Optional, List, Iterator
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from dify.dify_client import DifyClient, DifyAPIError
+from util.ttl_cache import TTLCache, make_cache_key
 
 
 class AgentType(Enum):
@@ -41,10 +41,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -53,6 +53,8 @@ class BaseAgent(ABC):
         self.client = dify_client
         self.config = config
         self._validate_config()
+        # 预先拼接系统提示词前缀，避免每次请求重复拼接
+        self._query_prefix = f"{config.system_prompt}\n\n" if config.system_prompt else ""
     
     def _validate_config(self) -> None:
         """验证配置信息"""
@@ -61,15 +63,13 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法"""
-        pass
+        """处理请求，子类必须重写"""
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法"""
-        pass
+        """流式处理请求，子类必须重写"""
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """准备输入参数，合并默认参数和用户参数"""
@@ -87,9 +87,7 @@ class BaseAgent(ABC):
     
     def _build_query(self, query: str, **kwargs) -> str:
         """构建查询字符串，子类可以重写此方法来自定义查询格式"""
-        if self.config.system_prompt:
-            return f"{self.config.system_prompt}\n\n{query}"
-        return query
+        return self._query_prefix + query
     
     def _handle_response(self, raw_response: Dict[str, Any]) -> AgentResponse:
         """处理原始响应，转换为 AgentResponse 格式"""
@@ -98,7 +96,7 @@ class BaseAgent(ABC):
             metadata = {
                 'message_id': raw_response.get('message_id'),
                 'usage': raw_response.get('usage'),
-                'retriever_resources': raw_response.get('retriever_resources', [])
+                'retriever_resources': raw_response.get('retriever_resources', ())
             }
             
             return AgentResponse(
@@ -132,9 +130,12 @@ class ContentValidatorAgent(BaseAgent):
     可以检查语法、风格、合规性等多个维度。
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 5):
         """
         初始化文案验收器
+        
+        Args:
+            cache_size: 验收结果缓存容量，0 表示不缓存
         """
         endpoint = "http://119.45.130.88:8080/v1"
         app_key = "app-GtuTwwWLoOau4vwqYobvoV99"
@@ -152,6 +153,10 @@ class ContentValidatorAgent(BaseAgent):
         )
         
         super().__init__(dify_client, config)
+        
+        # 验收结果 LRU 缓存：相同的查询与输入直接复用上次结果，避免重复的 API 调用
+        self.cache_size = cache_size
+        self._cache = TTLCache(maxsize=cache_size)
     
     def process(self, params: Dict[str, Any]) -> AgentResponse:
         """验收文案内容
@@ -161,11 +166,14 @@ class ContentValidatorAgent(BaseAgent):
                 - query: 验收要求描述（必需）
                 - inputs: 额外输入参数（可选）
                 - user: 用户标识（可选）
+                - bypass_cache: 是否跳过验收结果缓存（可选，默认 False）
             
         Returns:
             AgentResponse: 验收结果
         """
         try:
+            params = dict(params)
+            bypass_cache = params.pop('bypass_cache', False)
             query = params.get('query', '')
             inputs = params.get('inputs')
             content_to_validate = params.get('content_to_validate')
@@ -186,6 +194,14 @@ class ContentValidatorAgent(BaseAgent):
             # 构建查询
             full_query = self._build_validation_query(query, content_to_validate)
             
+            use_cache = self.cache_size > 0 and not bypass_cache
+            if use_cache:
+                cache_key = make_cache_key(full_query, final_inputs, user)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    # 返回副本，调用方原地修改响应不会影响缓存
+                    return replace(cached, metadata={**(cached.metadata or {}), 'cache_hit': True})
+            
             # 调用 Dify API
             raw_response = self.client.completion_messages_blocking(
                 query=full_query,
@@ -193,7 +209,12 @@ class ContentValidatorAgent(BaseAgent):
                 user=user
             )
             
-            return self._handle_response(raw_response)
+            response = self._handle_response(raw_response)
+            # 只缓存成功的验收结果，失败时下次仍会重新请求
+            if use_cache and response.success:
+                # 元数据字典也复制一份，调用方修改返回结果的元数据不会影响缓存
+                self._cache.put(cache_key, replace(response, metadata=dict(response.metadata or {})))
+            return response
             
         except DifyAPIError as e:
             return AgentResponse(
@@ -262,6 +283,10 @@ class ContentValidatorAgent(BaseAgent):
                 error_message=f"处理失败: {str(e)}"
             )
     
+    def clear_cache(self) -> None:
+        """清空验收结果缓存"""
+        self._cache.clear()
+    
     def _build_validation_query(self, query: str, content: Optional[str]) -> str:
         """构建验收查询"""
         base_query = self._build_query(query)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文案场景验收器 Agent 测试文件
+
+使用桩客户端测试验收结果缓存，不调用 Dify API
+"""
+
+from agents.content_validator.content_validator_agent import ContentValidatorAgent
+from dify.dify_client import DifyAPIError
+
+
+class _StubDifyClient:
+    """离线测试用的 Dify 客户端，记录 API 调用次数，可指定调用失败"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+    
+    def completion_messages_blocking(self, query=None, inputs=None, user=None, files=None):
+        self.calls += 1
+        if self.fail:
+            raise DifyAPIError(500, "internal_error", "服务异常")
+        return {'answer': '{"result": true, "reason": "符合要求"}', 'message_id': str(self.calls)}
+
+
+def _make_stub_validator(**kwargs):
+    validator = ContentValidatorAgent(**kwargs)
+    client = _StubDifyClient()
+    validator.client = client
+    return validator, client
+
+
+_PARAMS = {'query': '请验收这个养生文案是否符合要求', 'content_to_validate': '早睡早起身体好'}
+
+
+def test_validation_cache():
+    """测试相同请求复用验收结果"""
+    print("\n=== 验收结果缓存测试 ===")
+    
+    validator, client = _make_stub_validator()
+    first = validator.process(_PARAMS)
+    assert first.success and client.calls == 1
+    assert 'cache_hit' not in first.metadata
+    
+    second = validator.process(_PARAMS)
+    assert client.calls == 1
+    assert second.content == first.content
+    assert second.metadata['cache_hit'] is True
+    
+    # 不同的待验收内容会调用API
+    validator.process({**_PARAMS, 'content_to_validate': '多喝热水'})
+    assert client.calls == 2
+    print("验收结果缓存测试通过")
+
+
+def test_validation_cache_bypass():
+    """测试 bypass_cache=True 时跳过缓存"""
+    print("\n=== 跳过缓存测试 ===")
+    
+    validator, client = _make_stub_validator()
+    validator.process(_PARAMS)
+    response = validator.process({**_PARAMS, 'bypass_cache': True})
+    assert response.success and client.calls == 2
+    assert 'cache_hit' not in response.metadata
+    print("跳过缓存测试通过")
+
+
+def test_validation_failure_not_cached():
+    """测试失败的验收结果不会被缓存"""
+    print("\n=== 失败结果不缓存测试 ===")
+    
+    validator, client = _make_stub_validator()
+    client.fail = True
+    assert not validator.process(_PARAMS).success
+    
+    client.fail = False
+    response = validator.process(_PARAMS)
+    assert response.success and client.calls == 2
+    assert 'cache_hit' not in response.metadata
+    print("失败结果不缓存测试通过")
+
+
+def test_validation_cache_returns_copy():
+    """测试修改返回的响应不影响缓存"""
+    print("\n=== 缓存副本测试 ===")
+    
+    validator, client = _make_stub_validator()
+    first = validator.process(_PARAMS)
+    content = first.content
+    first.content = "已修改"
+    first.metadata['usage'] = "已修改"
+    
+    second = validator.process(_PARAMS)
+    assert second.content == content
+    assert second.metadata['usage'] is None
+    second.content = "再次修改"
+    assert validator.process(_PARAMS).content == content
+    assert client.calls == 1
+    print("缓存副本测试通过")
+
+
+if __name__ == "__main__":
+    test_validation_cache()
+    test_validation_cache_bypass()
+    test_validation_failure_not_cached()
+    test_validation_cache_returns_copy()
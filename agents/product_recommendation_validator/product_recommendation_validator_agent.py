@@ -6,7 +6,6 @@
 """
 
 from typing import Dict, Any, Optional, List, Iterator
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from dify.dify_client import DifyClient, DifyAPIError
@@ -42,10 +41,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -54,6 +53,8 @@ class BaseAgent(ABC):
         self.client = dify_client
         self.config = config
         self._validate_config()
+        # 预先拼接系统提示词前缀，避免每次请求重复拼接
+        self._query_prefix = f"{config.system_prompt}\n\n" if config.system_prompt else ""
     
     def _validate_config(self) -> None:
         """验证配置信息"""
@@ -62,15 +63,13 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法"""
-        pass
+        """处理请求，子类必须重写"""
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法"""
-        pass
+        """流式处理请求，子类必须重写"""
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """准备输入参数，合并默认参数和用户参数"""
@@ -88,9 +87,7 @@ class BaseAgent(ABC):
     
     def _build_query(self, query: str, **kwargs) -> str:
         """构建查询字符串，子类可以重写此方法来自定义查询格式"""
-        if self.config.system_prompt:
-            return f"{self.config.system_prompt}\n\n{query}"
-        return query
+        return self._query_prefix + query
     
     def _handle_response(self, raw_response: Dict[str, Any]) -> AgentResponse:
         """处理原始响应，转换为 AgentResponse 格式"""
@@ -99,7 +96,7 @@ class BaseAgent(ABC):
             metadata = {
                 'message_id': raw_response.get('message_id'),
                 'usage': raw_response.get('usage'),
-                'retriever_resources': raw_response.get('retriever_resources', [])
+                'retriever_resources': raw_response.get('retriever_resources', ())
             }
             
             return AgentResponse(
@@ -1,12 +1,22 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import json
+import numpy as np
 import pandas as pd
 import os
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+# 拼接多个特性时使用的分隔符，避免关键词跨特性误匹配
+_FEATURE_SEP = "\x1f"
+
+@dataclass(frozen=True)
 class ProductInfo:
-    """商品信息类"""
+    """商品信息类（只读，可安全共享和哈希）"""
     product_id: str
     name: str
     description: str
@@ -14,7 +24,7 @@ class ProductInfo:
     category: str
     brand: str
     image_url: str
-    features: List[str]
+    features: Tuple[str, ...]
     target_audience: str
     stock: int = 100
     rating: float = 4.5
@@ -34,7 +44,7 @@ class ProductInfo:
             "category": self.category,
             "brand": self.brand,
             "image_url": self.image_url,
-            "features": self.features,
+            "features": list(self.features),
             "target_audience": self.target_audience,
             "stock": self.stock,
             "rating": self.rating,
@@ -50,6 +60,8 @@ class ProductDatabase:
     
     def __init__(self):
         self._products = self._initialize_mock_data()
+        self._build_lookup_index()
+        self._build_score_index()
     
     def _initialize_mock_data(self) -> Dict[str, ProductInfo]:
         """从Excel文件读取商品数据"""
@@ -147,7 +159,7 @@ class ProductDatabase:
         else:
             return primary_str
     
-    def _extract_features(self, primary_category, selling_point) -> List[str]:
+    def _extract_features(self, primary_category, selling_point) -> Tuple[str, ...]:
         """从商品信息中提取特性"""
         features = []
         
@@ -171,7 +183,7 @@ class ProductDatabase:
             if "艾" in selling_str:
                 features.append("艾草制品")
         
-        return features if features else ["优质产品"]
+        return tuple(features) if features else ("优质产品",)
     
     def _extract_target_audience(self, primary_category) -> str:
         """从一级分类信息中提取目标用户群体"""
@@ -188,26 +200,54 @@ class ProductDatabase:
     
 
     
+    def _build_lookup_index(self) -> None:
+        """预先构建K3编码、分类和目标人群的索引（商品目录静态，只需构建一次）"""
+        by_k3_code: Dict[str, ProductInfo] = {}
+        by_category: Dict[str, List[ProductInfo]] = defaultdict(list)
+        by_audience: Dict[str, List[ProductInfo]] = defaultdict(list)
+        for product in self._products.values():
+            # K3编码重复时保留第一个商品，与顺序查找的结果一致
+            by_k3_code.setdefault(product.k3_code, product)
+            by_category[product.category].append(product)
+            by_audience[product.target_audience.lower()].append(product)
+        self._by_k3_code = by_k3_code
+        self._by_category = dict(by_category)
+        self._by_audience = dict(by_audience)
+    
+    def _build_score_index(self) -> None:
+        """预先构建推荐打分用的小写字段数组（商品目录静态，只需构建一次）"""
+        products = list(self._products.values())
+        self._score_products = products
+        self._category_arr = np.array([p.category.lower() for p in products], dtype=str)
+        self._audience_arr = np.array([p.target_audience.lower() for p in products], dtype=str)
+        self._description_arr = np.array([p.description.lower() for p in products], dtype=str)
+        self._features_arr = np.array(
+            [_FEATURE_SEP.join(f.lower() for f in p.features) for p in products], dtype=str
+        )
+    
     def get_product_by_id(self, product_id: str) -> Optional[ProductInfo]:
         """根据商品ID获取商品信息"""
         return self._products.get(product_id)
     
     def get_product_by_k3_code(self, k3_code: str) -> Optional[ProductInfo]:
-        """根据K3编码获取商品信息"""
-        for product in self._products.values():
-            if product.k3_code == k3_code:
-                return product
-        return None
+        """根据K3编码获取商品信息，不存在的编码直接通过索引排除"""
+        return self._by_k3_code.get(k3_code)
     
     def get_products_by_category(self, category: str) -> List[ProductInfo]:
         """根据分类获取商品列表"""
-        return [product for product in self._products.values() 
-                if product.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_products_by_target_audience(self, target_audience: str) -> List[ProductInfo]:
         """根据目标用户群体获取商品列表"""
-        return [product for product in self._products.values() 
-                if target_audience.lower() in product.target_audience.lower()]
+        # 只需扫描去重后的人群描述，而不是全部商品
+        keyword = target_audience.lower()
+        matched = [products for audience, products in self._by_audience.items()
+                   if keyword in audience]
+        if len(matched) == 1:
+            return list(matched[0])
+        # 多个人群命中时按商品原有顺序返回
+        matched_ids = {id(product) for products in matched for product in products}
+        return [product for product in self._products.values() if id(product) in matched_ids]
     
     def search_products(self, keyword: str) -> List[ProductInfo]:
         """根据关键词搜索商品"""
@@ -245,31 +285,29 @@ class ProductDatabase:
         interests = user_profile.get('interests', [])
         health_goals = user_profile.get('health_goals', [])
         
-        scored_products = []
+        scores = np.zeros(len(self._score_products), dtype=np.int64)
         
-        for product in self._products.values():
-            score = 0
-            
-            # 根据兴趣匹配
-            for interest in interests:
-                if interest.lower() in product.category.lower() or \
-                   interest.lower() in product.target_audience.lower():
-                    score += 2
-            
-            # 根据健康目标匹配
-            for goal in health_goals:
-                if goal.lower() in product.description.lower() or \
-                   any(goal.lower() in feature.lower() for feature in product.features):
-                    score += 3
-            
-            if score > 0:
-                scored_products.append((product, score))
+        # 根据兴趣匹配（分类或目标人群命中 +2）
+        for interest in interests:
+            term = interest.lower()
+            hit = (np.char.find(self._category_arr, term) >= 0) | \
+                  (np.char.find(self._audience_arr, term) >= 0)
+            scores += 2 * hit
+        
+        # 根据健康目标匹配（描述或任一特性命中 +3）
+        for goal in health_goals:
+            term = goal.lower()
+            hit = (np.char.find(self._description_arr, term) >= 0) | \
+                  (np.char.find(self._features_arr, term) >= 0)
+            scores += 3 * hit
         
-        # 按分数排序并返回前N个
-        scored_products.sort(key=lambda x: x[1], reverse=True)
-        return [product for product, score in scored_products[:limit]]
+        # 按分数排序并返回前N个（稳定排序，同分保持原有顺序）
+        order = np.argsort(-scores, kind='stable')
+        return [self._score_products[i] for i in order[:limit] if scores[i] > 0]
     
     def to_json(self) -> str:
         """将所有商品信息转换为JSON格式"""
-        products_dict = {pid: product.to_dict() for pid, product in self._products.items()}
-        return json.dumps(products_dict, ensure_ascii=False, indent=2)
\ No newline at end of file
+        # 直接序列化商品对象，避免先构建完整的中间字典
+        if orjson is not None:
+            return orjson.dumps(self._products, option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(self._products, default=vars, ensure_ascii=False, indent=2)
\ No newline at end of file
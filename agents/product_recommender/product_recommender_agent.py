@@ -5,14 +5,18 @@
 专门用于根据用户需求和场景推荐合适的商品
 """
 
+import json
 from typing import Dict, Any, Optional, List, Iterator
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from dify.dify_client import DifyClient, DifyAPIError
 from .product_database import ProductDatabase
 
 
+# 不作为 inputs 透传给 Dify 的特殊参数
+_SPECIAL_PARAMS = frozenset({'query', 'inputs', 'user'})
+
+
 class AgentType(Enum):
     """Agent 类型枚举"""
     CONTENT_VALIDATOR = "content_validator"  # 文案场景验收器
@@ -33,7 +37,7 @@ class AgentConfig:
     max_tokens: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Agent 响应结果"""
     success: bool
@@ -43,10 +47,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -55,6 +59,8 @@ class BaseAgent(ABC):
         self.client = dify_client
         self.config = config
         self._validate_config()
+        # 预先拼接系统提示词前缀，避免每次请求重复拼接
+        self._query_prefix = f"{config.system_prompt}\n\n" if config.system_prompt else ""
     
     def _validate_config(self) -> None:
         """验证配置信息"""
@@ -63,15 +69,13 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法"""
-        pass
+        """处理请求，子类必须重写"""
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法"""
-        pass
+        """流式处理请求，子类必须重写"""
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """准备输入参数，合并默认参数和用户参数"""
@@ -89,9 +93,7 @@ class BaseAgent(ABC):
     
     def _build_query(self, query: str, **kwargs) -> str:
         """构建查询字符串，子类可以重写此方法来自定义查询格式"""
-        if self.config.system_prompt:
-            return f"{self.config.system_prompt}\n\n{query}"
-        return query
+        return self._query_prefix + query
     
     def _handle_response(self, raw_response: Dict[str, Any]) -> AgentResponse:
         """处理原始响应，转换为 AgentResponse 格式"""
@@ -100,7 +102,7 @@ class BaseAgent(ABC):
             metadata = {
                 'message_id': raw_response.get('message_id'),
                 'usage': raw_response.get('usage'),
-                'retriever_resources': raw_response.get('retriever_resources', [])
+                'retriever_resources': raw_response.get('retriever_resources', ())
             }
             
             return AgentResponse(
@@ -134,6 +136,8 @@ class ProductRecommenderAgent(BaseAgent):
     支持根据不同的参数和条件生成个性化的商品推荐。
     """
     
+    SPECIAL_PARAMS = _SPECIAL_PARAMS
+    
     def __init__(self, 
                  endpoint: str = "http://119.45.130.88:8080/v1",
                  app_key: str = "app-oM9cjamwbeTy4em5KoEUvuDL"):
@@ -159,6 +163,9 @@ class ProductRecommenderAgent(BaseAgent):
         
         # 初始化商品数据库
         self.product_db = ProductDatabase()
+        # 商品列表JSON及商品数量，首次使用时生成（商品库初始化后不再变化）
+        self._goods_list_json: Optional[str] = None
+        self._goods_count = 0
         
         super().__init__(dify_client, config)
     
@@ -179,51 +186,40 @@ class ProductRecommenderAgent(BaseAgent):
             AgentResponse: 推荐结果
         """
         try:
-            query = params.get('query', '')
-            inputs = params.get('inputs')
-            user_profile = params.get('user_profile')
-            scenario = params.get('scenario')
-            budget = params.get('budget')
-            category = params.get('category')
-            user = params.get('user', 'product_recommender')
-            
-            # 准备输入参数
-            final_inputs = self._prepare_inputs(inputs)
+            get = params.get
+            query, inputs, user_profile, scenario, budget, category, user = (
+                get('query', ''), get('inputs'), get('user_profile'), get('scenario'),
+                get('budget'), get('category'), get('user', 'product_recommender'),
+            )
+            defaults = self.config.default_inputs
             
-            # 添加query到inputs中（某些Dify应用需要）
-            final_inputs["query"] = query
+            # 一次性合并默认参数、用户参数、query 及其他业务参数（除了特殊参数）
+            final_inputs = {
+                **(defaults or {}),
+                **(inputs or {}),
+                "query": query,
+                **{k: v for k, v in params.items()
+                   if k not in _SPECIAL_PARAMS and v is not None},
+            }
             
             # 自动补齐goods_list参数
-            goods_list = params.get('goods_list')
+            goods_list = get('goods_list')
             if not goods_list:  # 如果goods_list为空或None，自动补齐
                 goods_list = self._get_goods_list_json()
                 final_inputs["goods_list"] = goods_list
 
                 # 打印final_inputs的数量和内容（在所有参数添加完成后）
                 print(f"📊 goods_list 信息:")
-                # goods_list是JSON字符串，需要解析后计算商品数量
-                import json
-                try:
-                    goods_data = json.loads(goods_list)
-                    goods_count = len(goods_data) if isinstance(goods_data, list) else 0
-                    print(f"  goods_list商品数量: {goods_count}")
-                    print(f"  goods_list字符串长度: {len(goods_list)}")
-                except Exception as e:
-                    print(f"  goods_list解析失败: {e}")
-                    print(f"  goods_list字符串长度: {len(goods_list)}")
-            
-            # 将所有其他参数添加到inputs中（除了特殊参数）
-            special_params = {'query', 'inputs', 'user'}
-            for key, value in params.items():
-                if key not in special_params and value is not None:
-                    final_inputs[key] = value
-            
+                # 商品数量在生成JSON时已记录，无需再解析一遍
+                print(f"  goods_list商品数量: {self._goods_count}")
+                print(f"  goods_list字符串长度: {len(goods_list)}")
             
             # 打印每个参数的详细信息
             for key, value in final_inputs.items():
-                if key == "goods_list":
+                if key == "goods_list" and value is self._goods_list_json:
+                    print(f"  {key}: JSON字符串，包含 {self._goods_count} 个商品")
+                elif key == "goods_list":
                     # goods_list是JSON字符串，计算商品数量
-                    import json
                     try:
                         goods_data = json.loads(value) if isinstance(value, str) else value
                         goods_count = len(goods_data) if isinstance(goods_data, list) else 0
@@ -273,32 +269,28 @@ class ProductRecommenderAgent(BaseAgent):
             AgentResponse: 流式推荐结果
         """
         try:
-            query = params.get('query', '')
-            inputs = params.get('inputs')
-            user_profile = params.get('user_profile')
-            scenario = params.get('scenario')
-            budget = params.get('budget')
-            category = params.get('category')
-            user = params.get('user', 'product_recommender')
-            
-            # 准备输入参数
-            final_inputs = self._prepare_inputs(inputs)
+            get = params.get
+            query, inputs, user_profile, scenario, budget, category, user = (
+                get('query', ''), get('inputs'), get('user_profile'), get('scenario'),
+                get('budget'), get('category'), get('user', 'product_recommender'),
+            )
+            defaults = self.config.default_inputs
             
-            # 添加query到inputs中
-            final_inputs["query"] = query
+            # 一次性合并默认参数、用户参数、query 及其他业务参数
+            final_inputs = {
+                **(defaults or {}),
+                **(inputs or {}),
+                "query": query,
+                **{k: v for k, v in params.items()
+                   if k not in _SPECIAL_PARAMS and v is not None},
+            }
             
             # 自动补齐goods_list参数
-            goods_list = params.get('goods_list')
+            goods_list = get('goods_list')
             if not goods_list:  # 如果goods_list为空或None，自动补齐
                 goods_list = self._get_goods_list_json()
                 final_inputs["goods_list"] = goods_list
             
-            # 将所有其他参数添加到inputs中
-            special_params = {'query', 'inputs', 'user'}
-            for key, value in params.items():
-                if key not in special_params and value is not None:
-                    final_inputs[key] = value
-            
             # 构建查询
             full_query = self._build_recommendation_query(query, user_profile, scenario, budget, category)
             
@@ -309,11 +301,9 @@ class ProductRecommenderAgent(BaseAgent):
                 user=user
             ):
                 if chunk.get('event') == 'message':
-                    content = chunk.get('answer', '')
                     yield AgentResponse(
                         success=True,
-                        content=content,
-                        metadata={'chunk': chunk},
+                        content=chunk.get('answer', ''),
                         raw_response=chunk
                     )
                 elif chunk.get('event') == 'message_end':
@@ -339,18 +329,19 @@ class ProductRecommenderAgent(BaseAgent):
                                   scenario: str = None, budget: str = None, 
                                   category: str = None) -> str:
         """构建商品推荐查询"""
-        query_parts = [query]
+        # 常见情况：没有任何附加信息，直接使用原始查询
+        if not (user_profile or scenario or budget or category):
+            return self._build_query(query)
         
-        if user_profile:
-            query_parts.append(f"用户画像: {user_profile}")
-        if scenario:
-            query_parts.append(f"使用场景: {scenario}")
-        if budget:
-            query_parts.append(f"预算范围: {budget}")
-        if category:
-            query_parts.append(f"商品类别: {category}")
+        query_parts = (
+            query,
+            f"用户画像: {user_profile}" if user_profile else None,
+            f"使用场景: {scenario}" if scenario else None,
+            f"预算范围: {budget}" if budget else None,
+            f"商品类别: {category}" if category else None,
+        )
         
-        full_query = "\n".join(query_parts)
+        full_query = "\n".join(part for part in query_parts if part is not None)
         return self._build_query(full_query)
     
     def _get_goods_list_json(self) -> str:
@@ -359,6 +350,8 @@ class ProductRecommenderAgent(BaseAgent):
         Returns:
             str: 商品列表的JSON字符串
         """
+        if self._goods_list_json is not None:
+            return self._goods_list_json
         try:
             # 获取所有商品信息
             all_products = self.product_db.get_all_products()
@@ -393,10 +386,10 @@ class ProductRecommenderAgent(BaseAgent):
                 goods_list.append(goods_item)
             
             # 转换为JSON字符串
-            import json
-            return json.dumps(goods_list, ensure_ascii=False, indent=2)
+            self._goods_list_json = json.dumps(goods_list, ensure_ascii=False, indent=2)
+            self._goods_count = len(goods_list)
+            return self._goods_list_json
             
         except Exception as e:
             # 如果出现异常，返回空列表的JSON
-            import json
             return json.dumps([], ensure_ascii=False)
\ No newline at end of file
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品数据库推荐打分测试文件
+
+使用真实的产品资料库，对比向量化打分与逐个商品打分的推荐结果
+"""
+
+from agents.product_recommender.product_database import ProductDatabase
+
+
+def _baseline_recommend(db: ProductDatabase, user_profile, limit: int = 3):
+    """逐个商品打分的参考实现（与向量化前的推荐逻辑一致）"""
+    interests = user_profile.get('interests', [])
+    health_goals = user_profile.get('health_goals', [])
+    
+    scored_products = []
+    for product in db.get_all_products():
+        score = 0
+        for interest in interests:
+            if interest.lower() in product.category.lower() or \
+               interest.lower() in product.target_audience.lower():
+                score += 2
+        for goal in health_goals:
+            if goal.lower() in product.description.lower() or \
+               any(goal.lower() in feature.lower() for feature in product.features):
+                score += 3
+        if score > 0:
+            scored_products.append((product, score))
+    
+    scored_products.sort(key=lambda x: x[1], reverse=True)
+    return [product for product, score in scored_products[:limit]]
+
+
+def _assert_same(db: ProductDatabase, user_profile, limit: int = 3):
+    expected = _baseline_recommend(db, user_profile, limit)
+    actual = db.get_recommended_products(user_profile, limit)
+    assert [p.product_id for p in actual] == [p.product_id for p in expected], user_profile
+    return actual
+
+
+def test_recommendation_matches_baseline():
+    """测试推荐结果（排序、同分顺序、数量截断）与参考实现一致"""
+    print("\n=== 推荐打分一致性测试 ===")
+    
+    db = ProductDatabase()
+    products = db.get_all_products()
+    
+    categories = sorted({p.category for p in products})
+    audiences = sorted({p.target_audience for p in products})
+    features = sorted({f for p in products for f in p.features})
+    
+    profiles = [
+        # 大量同分商品，检验同分时保持原有顺序
+        {'interests': [categories[0]]},
+        {'interests': [audiences[0].upper()]},
+        {'interests': categories[:2], 'health_goals': features[:2]},
+        {'health_goals': ['艾草', '睡眠', '养胃']},
+        {'interests': ['健康'], 'health_goals': ['健康']},
+    ]
+    profiles += [{'health_goals': [feature]} for feature in features[:20]]
+    profiles += [{'interests': [category]} for category in categories]
+    
+    for profile in profiles:
+        for limit in (1, 3, 10, len(products) + 1):
+            _assert_same(db, profile, limit)
+    
+    print(f"{len(profiles)} 个用户画像的推荐结果一致")
+
+
+def test_recommendation_zero_score():
+    """测试没有命中的商品不会被推荐"""
+    print("\n=== 零分过滤测试 ===")
+    
+    db = ProductDatabase()
+    assert _assert_same(db, {}) == []
+    assert _assert_same(db, {'interests': ['不存在的分类'], 'health_goals': ['不存在的功效']}) == []
+    
+    # 命中商品少于limit时只返回命中的商品
+    feature = db.get_all_products()[0].features[0]
+    recommended = _assert_same(db, {'health_goals': [feature]}, limit=len(db.get_all_products()))
+    assert recommended
+    assert all(
+        feature.lower() in p.description.lower() or any(feature.lower() in f.lower() for f in p.features)
+        for p in recommended
+    )
+    print("零分过滤测试通过")
+
+
+if __name__ == "__main__":
+    test_recommendation_matches_baseline()
+    test_recommendation_zero_score()
@@ -5,12 +5,13 @@
 专门用于生成各种场景内容，如营销场景、用户故事、测试用例等
 """
 
+import json
 from typing import Dict, Any, Optional, List, Iterator
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from dify.dify_client import DifyClient, DifyAPIError
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from agents.product_recommender.product_database import ProductDatabase
 
 
@@ -43,10 +44,10 @@ class AgentResponse:
     error_message: Optional[str] = None
 
 
-class BaseAgent(ABC):
-    """基础 Agent 抽象类
+class BaseAgent:
+    """基础 Agent 类
     
-    所有具体的 Agent 都应该继承这个类，并实现相应的抽象方法。
+    所有具体的 Agent 都应该继承这个类，并重写 process 与 process_streaming 方法（基类实现会抛出 NotImplementedError）。
     提供了统一的接口和基础功能，确保代码的一致性和可扩展性。
     """
     
@@ -55,6 +56,8 @@ class BaseAgent(ABC):
         self.client = dify_client
         self.config = config
         self._validate_config()
+        # 预先拼接系统提示词前缀，避免每次请求重复拼接
+        self._query_prefix = f"{config.system_prompt}\n\n" if config.system_prompt else ""
     
     def _validate_config(self) -> None:
         """验证配置信息"""
@@ -63,15 +66,13 @@ class BaseAgent(ABC):
         if not isinstance(self.config.agent_type, AgentType):
             raise ValueError("Invalid agent type")
     
-    @abstractmethod
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理请求的抽象方法"""
-        pass
+        """处理请求，子类必须重写"""
+        raise NotImplementedError
     
-    @abstractmethod
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理请求的抽象方法"""
-        pass
+        """流式处理请求，子类必须重写"""
+        raise NotImplementedError
     
     def _prepare_inputs(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """准备输入参数，合并默认参数和用户参数"""
@@ -89,13 +90,10 @@ class BaseAgent(ABC):
     
     def _build_query(self, query: str, **kwargs) -> str:
         """构建查询字符串，子类可以重写此方法来自定义查询格式"""
-        if self.config.system_prompt:
-            return f"{self.config.system_prompt}\n\n{query}"
-        return query
+        return self._query_prefix + query
     
     def _handle_response(self, raw_response: Dict[str, Any]) -> AgentResponse:
         """处理原始响应，转换为 AgentResponse 格式"""
-        import json
         try:
             answer = raw_response.get('answer', '')
             
@@ -144,7 +142,7 @@ class BaseAgent(ABC):
             metadata = {
                 'message_id': raw_response.get('message_id'),
                 'usage': raw_response.get('usage'),
-                'retriever_resources': raw_response.get('retriever_resources', [])
+                'retriever_resources': raw_response.get('retriever_resources', ())
             }
             
             return AgentResponse(
@@ -362,11 +360,14 @@ class ScenarioGeneratorAgent(BaseAgent):
         Returns:
             List[AgentResponse]: 场景列表
         """
-        results = []
+        if count <= 0:
+            return []
         
-        for i in range(count):
-            query = f"{base_query} (变体 {i+1})"
-            result = self.process({'query': query, 'scenario_type': scenario_type})
-            results.append(result)
+        params_list = [
+            {'query': f"{base_query} (变体 {i+1})", 'scenario_type': scenario_type}
+            for i in range(count)
+        ]
         
-        return results
\ No newline at end of file
+        # 各变体相互独立，并发请求；map 按提交顺序返回结果
+        with ThreadPoolExecutor(max_workers=min(count, 8)) as executor:
+            return list(executor.map(self.process, params_list))
\ No newline at end of file
@@ -4,13 +4,6 @@
 场景验收器 Agent 测试文件
 """
 
-import sys
-import os
-
-# 添加项目根目录到 Python 路径
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.insert(0, project_root)
-
 from agents.scenario_validator.scenario_validator_agent import ScenarioValidatorAgent
 
 
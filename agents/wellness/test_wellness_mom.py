@@ -5,10 +5,28 @@
 测试养生妈妈Agent的各项功能
 """
 
+import time
 import warnings
 from agents.wellness.wellness_mom_agent import WellnessMomAgent
 
 
+class _StubDifyClient:
+    """离线测试用的 Dify 客户端，记录 API 调用次数"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def completion_messages_blocking(self, query=None, inputs=None, user=None, files=None):
+        self.calls += 1
+        return {'answer': f"建议{self.calls}: {query}", 'message_id': str(self.calls)}
+
+
+def _make_stub_agent(**kwargs):
+    client = _StubDifyClient()
+    agent = WellnessMomAgent("test-key", "http://localhost", "test-app", dify_client=client, **kwargs)
+    return agent, client
+
+
 def test_basic_wellness_advice():
     """测试基本养生建议功能"""
     print("\n=== 测试基本养生建议 ===")
@@ -37,9 +55,66 @@ def test_basic_wellness_advice():
         return False
 
 
+def test_response_cache():
+    """测试响应缓存命中（不调用 Dify API）"""
+    print("\n=== 测试响应缓存 ===")
+    
+    agent, client = _make_stub_agent()
+    first = agent.process({'query': '秋季养肺'})
+    assert first.success and client.calls == 1
+    assert 'cache_hit' not in first.metadata
+    first.metadata['usage'] = "已修改"
+    
+    second = agent.process({'query': '秋季养肺'})
+    assert client.calls == 1
+    assert second.content == first.content
+    assert second.metadata['cache_hit'] is True
+    assert second.metadata['usage'] is None
+    
+    # 返回的是副本，修改后不影响缓存
+    second.content = "已修改"
+    assert agent.process({'query': '秋季养肺'}).content == first.content
+    
+    # 不同查询与跳过缓存都会调用API
+    agent.process({'query': '冬季养肾'})
+    assert client.calls == 2
+    agent.process({'query': '秋季养肺', 'bypass_cache': True})
+    assert client.calls == 3
+    print("响应缓存测试通过")
+
+
+def test_response_cache_expiry():
+    """测试缓存过期后重新调用API"""
+    print("\n=== 测试缓存过期 ===")
+    
+    agent, client = _make_stub_agent(cache_ttl=0.05)
+    agent.process({'query': '秋季养肺'})
+    agent.process({'query': '秋季养肺'})
+    assert client.calls == 1
+    time.sleep(0.1)
+    response = agent.process({'query': '秋季养肺'})
+    assert client.calls == 2
+    assert 'cache_hit' not in response.metadata
+    print("缓存过期测试通过")
+
+
+def test_response_cache_disabled():
+    """测试 cache_size=0 时关闭缓存"""
+    print("\n=== 测试关闭缓存 ===")
+    
+    agent, client = _make_stub_agent(cache_size=0)
+    agent.process({'query': '秋季养肺'})
+    agent.process({'query': '秋季养肺'})
+    assert client.calls == 2
+    assert len(agent._cache) == 0
+    print("关闭缓存测试通过")
+
 
 def main():
     test_basic_wellness_advice()
+    test_response_cache()
+    test_response_cache_expiry()
+    test_response_cache_disabled()
 
 
 if __name__ == '__main__':
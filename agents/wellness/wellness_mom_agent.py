@@ -6,9 +6,14 @@
 """
 
 from typing import Dict, Any, Optional, List, Iterator
+from dataclasses import replace
 from dify.dify_client import DifyClient, DifyAPIError
+from util.ttl_cache import TTLCache, make_cache_key
 from agents.agents import AgentType, AgentConfig, AgentResponse, BaseAgent
 
+# 单独处理、不直接透传到 inputs 的参数
+_SPECIAL_PARAMS = frozenset({'query', 'inputs', 'user'})
+
 
 class WellnessMomAgent(BaseAgent):
     """养生妈妈 Agent
@@ -16,9 +21,17 @@ class WellnessMomAgent(BaseAgent):
     专门提供健康养生建议、育儿指导、营养搭配等温馨贴心的服务
     """
     
-    def __init__(self, api_key: str, base_url: str, app_id: str):
-        """初始化养生妈妈 Agent"""
-        dify_client = DifyClient(api_key=api_key, base_url=base_url)
+    def __init__(self, api_key: str, base_url: str, app_id: str, dify_client: Optional[DifyClient] = None,
+                 cache_size: int = 128, cache_ttl: float = 3600):
+        """初始化养生妈妈 Agent
+        
+        Args:
+            dify_client: 已创建的 Dify 客户端（可选），未传入时按 api_key/base_url 创建
+            cache_size: 响应缓存容量，0 表示不缓存
+            cache_ttl: 缓存结果的有效期（秒）
+        """
+        if dify_client is None:
+            dify_client = DifyClient(api_key=api_key, base_url=base_url)
         
         config = AgentConfig(
             name="养生妈妈",
@@ -30,10 +43,21 @@ class WellnessMomAgent(BaseAgent):
         )
         
         super().__init__(dify_client, config)
+        
+        # 响应 TTL LRU 缓存：相同的查询与输入（如同一季节的养生建议）直接复用结果，避免重复的 API 调用
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
     
     def process(self, params: Dict[str, Any]) -> AgentResponse:
-        """处理养生建议请求"""
+        """处理养生建议请求
+        
+        params 中的 bypass_cache 为 True 时跳过响应缓存
+        """
         try:
+            params = dict(params)
+            bypass_cache = params.pop('bypass_cache', False)
+            
             # 准备输入参数
             final_inputs = self._prepare_inputs(params)
             
@@ -49,14 +73,25 @@ class WellnessMomAgent(BaseAgent):
             # 构建查询
             query = self._build_query(user_query)
             
+            use_cache = self.cache_size > 0 and not bypass_cache
+            if use_cache:
+                cache_key = make_cache_key(query, final_inputs)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    # 返回副本，调用方原地修改响应（如去除代码块标记）不会影响缓存
+                    return replace(cached, metadata={**(cached.metadata or {}), 'cache_hit': True})
+            
             # 调用 Dify API
-            response = self.client.completion_messages_blocking(
+            response = self._handle_response(self.client.completion_messages_blocking(
                 inputs=final_inputs,
                 query=query,
                 user="wellness_user"
-            )
-            
-            return self._handle_response(response)
+            ))
+            # 只缓存成功的结果，失败时下次仍会重新请求
+            if use_cache and response.success:
+                # 元数据字典也复制一份，调用方修改返回结果的元数据不会影响缓存
+                self._cache.put(cache_key, replace(response, metadata=dict(response.metadata or {})))
+            return response
             
         except DifyAPIError as e:
             return AgentResponse(
@@ -71,50 +106,6 @@ class WellnessMomAgent(BaseAgent):
                 error_message=str(e)
             )
     
-    def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
-        """流式处理养生建议请求"""
-        try:
-            # 准备输入参数
-            final_inputs = self._prepare_inputs(params)
-            
-            # 获取用户查询
-            user_query = params.get('query', '')
-            if not user_query:
-                yield AgentResponse(
-                    success=False,
-                    content="",
-                    error_message="缺少用户查询内容"
-                )
-                return
-            
-            # 构建查询
-            query = self._build_query(user_query)
-            
-            # 调用 Dify API 流式接口
-            for response in self.client.completion_messages_streaming(
-                inputs=final_inputs,
-                query=query,
-                user="wellness_user"
-            ):
-                yield self._handle_response(response)
-                
-        except DifyAPIError as e:
-            yield AgentResponse(
-                success=False,
-                content="",
-                error_message=f"Dify API 错误: {str(e)}"
-            )
-        except Exception as e:
-            yield AgentResponse(
-                success=False,
-                content="",
-                error_message=str(e)
-            )
-
-
-
-
-    
     def process_streaming(self, params: Dict[str, Any]) -> Iterator[AgentResponse]:
         """流式提供养生建议
         
@@ -138,17 +129,13 @@ class WellnessMomAgent(BaseAgent):
             lifestyle = params.get('lifestyle')
             user = params.get('user', 'wellness_user')
             
-            # 准备输入参数
+            # 准备输入参数，并添加query
             final_inputs = self._prepare_inputs(inputs)
-            
-            # 添加query到inputs中
             final_inputs["query"] = query
             
-            # 将其他参数添加到inputs中
-            special_params = {'query', 'inputs', 'user'}
-            for key, value in params.items():
-                if key not in special_params and value is not None:
-                    final_inputs[key] = value
+            # 其他非空参数一次性合并到inputs中
+            final_inputs.update({key: value for key, value in params.items()
+                                 if value is not None and key not in _SPECIAL_PARAMS})
             
             # 构建养生查询
             full_query = self._build_wellness_query(query, age_group, health_concern, lifestyle)
@@ -159,7 +146,7 @@ class WellnessMomAgent(BaseAgent):
                 inputs=final_inputs,
                 user=user
             ):
-                yield self._handle_response(chunk)
+                yield self._handle_stream_chunk(chunk)
                 
         except DifyAPIError as e:
             yield AgentResponse(
@@ -174,6 +161,10 @@ class WellnessMomAgent(BaseAgent):
                 error_message=f"处理失败: {str(e)}"
             )
     
+    def clear_cache(self) -> None:
+        """清空响应缓存"""
+        self._cache.clear()
+    
     def _build_wellness_query(self, 
                              query: str, 
                              age_group: Optional[str], 
@@ -182,6 +173,10 @@ class WellnessMomAgent(BaseAgent):
         """构建养生建议查询"""
         base_query = self._build_query(query)
         
+        # 大多数请求不带附加信息，直接返回基础查询
+        if not (age_group or health_concern or lifestyle):
+            return base_query
+        
         additional_info = []
         if age_group:
             additional_info.append(f"年龄段：{age_group}")
@@ -190,10 +185,7 @@ class WellnessMomAgent(BaseAgent):
         if lifestyle:
             additional_info.append(f"生活方式：{lifestyle}")
         
-        if additional_info:
-            return f"{base_query}\n\n{chr(10).join(additional_info)}"
-        
-        return base_query
+        return base_query + "\n\n" + "\n".join(additional_info)
     
     def get_wellness_plan(self, 
                          user_profile: Dict[str, Any],
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+pytest 公共配置
+
+将项目根目录加入 Python 路径（只在此处设置一次），
+各测试文件无需再各自修改 sys.path。
+"""
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -6,11 +6,29 @@ Dify API 封装类
 """
 
 import json
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+# 流式响应中每条事件的数据前缀
+_SSE_DATA_PREFIX = b'data: '
+
+
+def _dumps_body(data: Dict[str, Any]) -> bytes:
+    """序列化请求体为 UTF-8 JSON，安装了 orjson 时优先使用（中文不转义，体积更小）"""
+    if orjson is not None:
+        # 与 json.dumps 一致地接受非字符串键；商品数据可能带有 numpy 数值
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
 
 class ResponseMode(Enum):
     """响应模式枚举"""
@@ -73,6 +91,24 @@ class DifyAPIError(Exception):
 class DifyClient:
     """Dify API 客户端"""
     
+    # 所有客户端实例共享的连接池，避免每个 Agent 各自建立 TCP 连接
+    _shared_session: Optional[requests.Session] = None
+    _shared_session_lock = threading.Lock()
+    
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """获取（必要时创建）共享的 requests.Session"""
+        if cls._shared_session is None:
+            with cls._shared_session_lock:
+                if cls._shared_session is None:
+                    session = requests.Session()
+                    # 工作流会并发调用多个 Agent，放大单个主机的连接池
+                    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    cls._shared_session = session
+        return cls._shared_session
+    
     def __init__(self, api_key: str, base_url: str = "http://119.45.130.88/v1"):
         """
         初始化Dify客户端
@@ -83,11 +119,12 @@ class DifyClient:
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = self._get_shared_session()
+        # 各实例的鉴权信息不同，随请求单独携带，不写入共享会话
+        self.headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
-        })
+        }
     
     def _handle_error_response(self, response: requests.Response) -> None:
         """处理错误响应"""
@@ -179,18 +216,19 @@ class DifyClient:
             data["files"] = [self._file_info_to_dict(f) for f in files]
         
         try:
-            response = self.session.post(url, json=data, stream=True)
+            response = self.session.post(url, data=_dumps_body(data), headers=self.headers, stream=True)
             
             if not response.ok:
                 self._handle_error_response(response)
             
-            # 处理流式响应
-            for line in response.iter_lines(decode_unicode=True):
-                if line.startswith('data: '):
+            # 处理流式响应：直接在字节上匹配前缀并解析，省去逐行解码
+            loads = orjson.loads if orjson is not None else json.loads
+            for line in response.iter_lines():
+                if line.startswith(_SSE_DATA_PREFIX):
                     try:
-                        data_str = line[6:]  # 移除 'data: ' 前缀
-                        if data_str.strip():
-                            chunk_data = json.loads(data_str)
+                        data_bytes = line[6:]  # 移除 'data: ' 前缀
+                        if data_bytes.strip():
+                            chunk_data = loads(data_bytes)
                             
                             # 检查是否有错误事件
                             if chunk_data.get('event') == 'error':
@@ -234,7 +272,7 @@ class DifyClient:
         
         print(f"## Request data: {data}")
         try:
-            response = self.session.post(url, json=data)
+            response = self.session.post(url, data=_dumps_body(data), headers=self.headers)
             if not response.ok:
                 self._handle_error_response(response)
             
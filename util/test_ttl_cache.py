@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TTLCache 测试文件
+"""
+
+import time
+
+from util.ttl_cache import TTLCache, make_cache_key
+
+
+def test_expiry():
+    """测试条目过期"""
+    print("\n=== 测试过期 ===")
+    
+    cache = TTLCache(maxsize=4, ttl=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    
+    # ttl为None时不过期
+    cache = TTLCache(maxsize=4)
+    cache.put("a", 1)
+    time.sleep(0.05)
+    assert cache.get("a") == 1
+    print("过期测试通过")
+
+
+def test_lru_eviction():
+    """测试超出容量时淘汰最久未使用的条目"""
+    print("\n=== 测试LRU淘汰 ===")
+    
+    cache = TTLCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # 访问a后，b成为最久未使用的条目
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    
+    # 覆盖写入不增加条目数
+    cache.put("a", 10)
+    assert cache.get("a") == 10
+    assert len(cache) == 2
+    print("LRU淘汰测试通过")
+
+
+def test_clear():
+    """测试清空缓存"""
+    print("\n=== 测试清空 ===")
+    
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
+    print("清空测试通过")
+
+
+def test_make_cache_key():
+    """测试缓存键生成"""
+    print("\n=== 测试缓存键 ===")
+    
+    key = make_cache_key("查询", {"a": 1, "b": "二"})
+    assert isinstance(key, bytes) and len(key) == 16
+    # 输入参数的键顺序不影响缓存键
+    assert make_cache_key("查询", {"b": "二", "a": 1}) == key
+    assert make_cache_key("查询", {"a": 2, "b": "二"}) != key
+    assert make_cache_key("查询", {"a": 1, "b": "二"}, "user") != key
+    print("缓存键测试通过")
+
+
+if __name__ == "__main__":
+    test_expiry()
+    test_lru_eviction()
+    test_clear()
+    test_make_cache_key()
@@ -7,11 +7,6 @@
 """
 
 import sys
-import os
-
-# 添加项目根目录到Python路径
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
 
 from util.youzan_product_scraper import YouZanProductScraper, get_youzan_product_images, ImageInfo
 
@@ -25,24 +20,25 @@ def test_basic_functionality():
     test_url = "https://shop18443051.m.youzan.com/wscgoods/detail/3ngm8yx62rws3ji"
     
     try:
-        with YouZanProductScraper() as scraper:
+        # 不使用共享缓存，保证每个网络测试都实际获取并解析页面
+        with YouZanProductScraper(use_cache=False) as scraper:
             print(f"正在测试URL: {test_url}")
             
             # 测试获取所有图片
             images = scraper.get_product_images(test_url)
-            print(f"\n找到 {len(images)} 张商品图片:")
-            
-            for i, img in enumerate(images, 1):
-                print(f"{i}. URL: {img.url}")
-                print(f"   尺寸类型: {img.size_type}")
-                print(f"   格式: {img.format}")
-                if img.alt_text:
-                    print(f"   描述: {img.alt_text}")
-                if img.width and img.height:
-                    print(f"   尺寸: {img.width}x{img.height}")
-                print()
-            
-            return len(images) > 0
+        print(f"\n找到 {len(images)} 张商品图片:")
+        
+        for i, img in enumerate(images, 1):
+            print(f"{i}. URL: {img.url}")
+            print(f"   尺寸类型: {img.size_type}")
+            print(f"   格式: {img.format}")
+            if img.alt_text:
+                print(f"   描述: {img.alt_text}")
+            if img.width and img.height:
+                print(f"   尺寸: {img.width}x{img.height}")
+            print()
+        
+        return len(images) > 0
             
     except Exception as e:
         print(f"基本功能测试失败: {str(e)}")
@@ -58,15 +54,15 @@ def test_high_quality_images():
     test_url = "https://shop18443051.m.youzan.com/wscgoods/detail/3ngm8yx62rws3ji"
     
     try:
-        with YouZanProductScraper() as scraper:
-            # 获取高质量图片
+        # 获取高质量图片
+        with YouZanProductScraper(use_cache=False) as scraper:
             hq_images = scraper.get_high_quality_images(test_url)
-            print(f"找到 {len(hq_images)} 张高质量图片:")
-            
-            for i, img in enumerate(hq_images, 1):
-                print(f"{i}. {img.url} (类型: {img.size_type})")
-            
-            return len(hq_images) > 0
+        print(f"找到 {len(hq_images)} 张高质量图片:")
+        
+        for i, img in enumerate(hq_images, 1):
+            print(f"{i}. {img.url} (类型: {img.size_type})")
+        
+        return len(hq_images) > 0
             
     except Exception as e:
         print(f"高质量图片测试失败: {str(e)}")
@@ -83,7 +79,8 @@ def test_convenience_function():
     
     try:
         # 测试便捷函数
-        urls = get_youzan_product_images(test_url, high_quality_only=True)
+        with YouZanProductScraper(use_cache=False) as scraper:
+            urls = get_youzan_product_images(test_url, high_quality_only=True, scraper=scraper)
         print(f"便捷函数获取到 {len(urls)} 个图片URL:")
         
         for i, url in enumerate(urls, 1):
@@ -159,6 +156,42 @@ def test_image_filtering():
     return True
 
 
+def test_cache():
+    """
+    测试缓存（不访问网络）
+    """
+    print("\n=== 测试缓存 ===")
+    
+    from util import youzan_product_scraper
+    
+    cache_url = "https://shop.example.youzan.com/wscgoods/detail/cache-test"
+    cached = (ImageInfo(url="https://img01.yzcdn.cn/upload_files/a.jpg", size_type="large"),)
+    
+    YouZanProductScraper.clear_cache()
+    youzan_product_scraper._images_cache.put(cache_url, cached)
+    
+    with YouZanProductScraper() as scraper:
+        # 命中缓存时每次返回新的列表，调用方修改不影响缓存
+        images = scraper.get_product_images(cache_url)
+        assert images == list(cached)
+        images.clear()
+        assert scraper.get_product_images(cache_url) == list(cached)
+        print("缓存命中，返回新列表")
+    
+    # 关闭缓存的实例不读取共享缓存
+    with YouZanProductScraper(use_cache=False) as scraper:
+        scraper._fetch_page_content = lambda url: "<html><body></body></html>"
+        assert scraper.get_product_images(cache_url) == []
+        print("use_cache=False 时绕过缓存")
+    
+    YouZanProductScraper.clear_cache()
+    assert len(youzan_product_scraper._images_cache) == 0
+    assert len(youzan_product_scraper._html_cache) == 0
+    print("clear_cache() 清空缓存")
+    
+    return True
+
+
 def main():
     """
     主测试函数
@@ -171,6 +204,7 @@ def main():
         "便捷函数": test_convenience_function(),
         "错误处理": test_url_validation(),
         "图片过滤": test_image_filtering(),
+        "缓存": test_cache(),
     }
     
     print("\n=== 测试结果汇总 ===")
@@ -9,19 +9,78 @@
 
 import re
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from typing import List, Dict, Any, Optional, Iterator
 from urllib.parse import urljoin, urlparse
-import time
 import logging
-from dataclasses import dataclass
+import threading
+from operator import attrgetter
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
+try:
+    from util.ttl_cache import TTLCache
+except ImportError:  # 在 util 目录下直接以脚本运行时
+    from ttl_cache import TTLCache
+
+# 日志级别与输出由调用方配置
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# 预编译的正则表达式
+# 明显不是商品图片的URL（logo、图标、广告、占位图等；SVG通常是logo和图标）
+_EXCLUDE_IMAGE_RE = re.compile(
+    r'logo|icon|avatar|thumb|banner|/ad[_-]|advertisement|placeholder|loading|default|skeleton|\.svg$'
+)
+# 有赞相关域名（包括img01.yzcdn.cn等子域名）
+_YOUZAN_DOMAIN_RE = re.compile(r'yzcdn\.cn|youzan')
+_IMAGE_EXT_RE = re.compile(r'\.(jpg|jpeg|png|webp)')
+_IMAGE_FORMAT_RE = re.compile(r'\.(jpg|jpeg|png|webp|gif)(?:\?|$)')
+_IMAGE_URL_FORMAT_RE = re.compile(r'\.(jpg|jpeg|png|webp)(?:\?|$)')
+# URL中的宽度参数，如 /w/750 或 w_750
+_WIDTH_PARAM_RE = re.compile(r'/w/\d+|w_\d+')
+_WIDTH_VALUE_RE = re.compile(r'(?:w[/_])(\d+)')
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+# 删除ASCII非数字字符的转换表，用于纯ASCII尺寸字符串
+_ASCII_NON_DIGIT_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+# HTML源码中的图片URL：可选的http(s)协议 + 协议相对部分
+_IMAGE_URL_RE = re.compile(r'(https?:)?(//[^\s\"\'>]+\.(?:jpg|jpeg|png|webp)(?:\?[^\s\"\'>]*)?)', re.I)
+
+# 尺寸类型的排序优先级，优先显示大图
+_SIZE_PRIORITY = {'large': 0, 'original': 1, 'medium': 2, 'thumbnail': 3}
+# 高质量图片的尺寸类型
+_HIGH_QUALITY_SIZE_TYPES = frozenset({'large', 'original', 'medium'})
+
+# 预编译的XPath，在libxml2中完成容器匹配
+# 轮播图容器（class 匹配 swiper.*item）中的第一张图片
+_SWIPER_FIRST_IMG_XPATH = etree.XPath(
+    "//div[contains(substring-after(normalize-space(@class), 'swiper'), 'item')]/descendant::img[1]"
+)
+# 图片类容器（class 不区分大小写包含 image/img/photo/pic/gallery）中的图片
+_LOWER_CLASS = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_IMAGE_CONTAINER_IMG_XPATH = etree.XPath(
+    "//div[" + " or ".join(
+        f"contains({_LOWER_CLASS}, '{word}')" for word in ('image', 'img', 'photo', 'pic', 'gallery')
+    ) + "]//img"
+)
+
+
+# 页面HTML与提取结果的缓存，在所有爬虫实例间共享
+_html_cache = TTLCache(maxsize=512, ttl=600)
+_images_cache = TTLCache(maxsize=256, ttl=600)
 
 
-@dataclass
+def _url_base(url: str) -> str:
+    """去除URL中的查询参数，没有参数时直接返回原字符串"""
+    return url.split('?', 1)[0] if '?' in url else url
+
+
+@dataclass(slots=True, frozen=True)
 class ImageInfo:
     """图片信息数据类"""
     url: str
@@ -30,6 +89,14 @@ class ImageInfo:
     height: Optional[int] = None
     format: str = "jpg"
     size_type: str = "original"  # original, thumbnail, medium, large
+    # 去除参数后的URL，用于去重，创建时计算一次
+    url_base: str = field(init=False, repr=False, compare=False)
+    # 按尺寸类型排序的优先级，创建时计算一次
+    priority: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'url_base', _url_base(self.url))
+        object.__setattr__(self, 'priority', _SIZE_PRIORITY.get(self.size_type, 4))
 
 
 class YouZanProductScraper:
@@ -39,23 +106,44 @@ class YouZanProductScraper:
     用于从有赞商品详情页面抓取商品大图URLs，支持多种图片格式和尺寸。
     """
     
-    def __init__(self, timeout: int = 10, retry_count: int = 3):
+    def __init__(self, timeout: int = 10, retry_count: int = 3, use_cache: bool = True):
         """
         初始化爬虫器
         
         Args:
             timeout: 请求超时时间（秒）
             retry_count: 重试次数
+            use_cache: 是否使用共享的页面与图片缓存。缓存有效期为10分钟，
+                期间商品页更新不会被感知；需要最新结果时传入False，
+                或调用 clear_cache() 清空缓存
         """
         self.timeout = timeout
         self.retry_count = retry_count
+        self.use_cache = use_cache
         self.session = requests.Session()
+        # 每个线程复用一个HTML解析器（lxml解析器不能跨线程共享）
+        self._parsers = threading.local()
+        
+        # 连接池复用TCP/TLS连接，并由urllib3负责重试与退避（总尝试次数仍为retry_count）
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=max(retry_count - 1, 0),
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # 设置请求头，模拟移动端浏览器访问
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            # gzip/deflate，安装了brotli时额外支持br
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -74,6 +162,11 @@ class YouZanProductScraper:
         Raises:
             Exception: 当网络请求失败或解析失败时抛出异常
         """
+        if self.use_cache:
+            cached_images = _images_cache.get(product_url)
+            if cached_images is not None:
+                return list(cached_images)
+        
         try:
             # 获取页面HTML内容
             html_content = self._fetch_page_content(product_url)
@@ -81,11 +174,13 @@ class YouZanProductScraper:
             # 解析HTML并提取图片信息
             images = self._extract_product_images(html_content, product_url)
             
-            logger.info(f"成功获取到 {len(images)} 张商品图片")
+            logger.info("成功获取到 %d 张商品图片", len(images))
+            if self.use_cache:
+                _images_cache.put(product_url, tuple(images))
             return images
             
         except Exception as e:
-            logger.error(f"获取商品图片失败: {str(e)}")
+            logger.error("获取商品图片失败: %s", e)
             raise
     
     def get_product_image_urls(self, product_url: str) -> List[str]:
@@ -114,33 +209,38 @@ class YouZanProductScraper:
         Raises:
             Exception: 当请求失败时抛出异常
         """
-        last_exception = None
+        if self.use_cache:
+            cached_html = _html_cache.get(url)
+            if cached_html is not None:
+                return cached_html
         
-        for attempt in range(self.retry_count):
-            try:
-                logger.info(f"正在获取页面内容 (尝试 {attempt + 1}/{self.retry_count}): {url}")
-                
-                response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                
-                # 让requests自动处理编码
-                response.encoding = response.apparent_encoding or 'utf-8'
-                
-                return response.text
-                
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"第 {attempt + 1} 次尝试失败: {str(e)}")
-                
-                if attempt < self.retry_count - 1:
-                    time.sleep(1)  # 重试前等待1秒
-        
-        raise Exception(f"获取页面内容失败，已重试 {self.retry_count} 次: {str(last_exception)}")
+        try:
+            logger.info("正在获取页面内容: %s", url)
+            
+            # 重试与退避由session上挂载的HTTPAdapter处理
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            
+            # 让requests自动处理编码
+            response.encoding = response.apparent_encoding or 'utf-8'
+            
+            if self.use_cache:
+                _html_cache.put(url, response.text)
+            return response.text
+            
+        except Exception as e:
+            raise Exception(f"获取页面内容失败，已重试 {self.retry_count} 次: {str(e)}")
     
     def _extract_product_images(self, html_content: str, base_url: str) -> List[ImageInfo]:
         """
         从HTML内容中提取商品图片信息
         
+        只解析一次DOM并遍历一次img节点，按以下来源分组后依次合并：
+        1. 轮播图容器（class含swiper...item）中的第一张图片
+        2. 图片类容器（class含image/img/photo/pic/gallery）中的图片
+        3. 其它符合商品图片规则的img标签
+        4. 正则表达式从HTML源码中直接提取的图片URL（适用于动态加载的页面）
+        
         Args:
             html_content: HTML内容
             base_url: 基础URL，用于处理相对路径
@@ -148,43 +248,44 @@ class YouZanProductScraper:
         Returns:
             List[ImageInfo]: 图片信息列表
         """
-        soup = BeautifulSoup(html_content, 'lxml')
-        images = []
-        
-        # 方法1: 查找轮播图容器中的图片
-        # 根据用户提供的HTML结构：<div class="custom-class tee-swiper-item"><img src="..."></div>
-        swiper_images = soup.find_all('div', class_=re.compile(r'.*swiper.*item.*'))
-        for div in swiper_images:
-            img_tag = div.find('img')
-            if img_tag and img_tag.get('src'):
-                image_info = self._create_image_info(img_tag, base_url)
-                if image_info:
-                    images.append(image_info)
-        
-        # 方法2: 查找所有可能的商品图片容器
-        # 查找包含商品图片的常见class名称
-        image_containers = soup.find_all('div', class_=re.compile(r'.*(image|img|photo|pic|gallery).*', re.I))
-        for container in image_containers:
-            img_tags = container.find_all('img')
-            for img_tag in img_tags:
-                if img_tag.get('src'):
-                    image_info = self._create_image_info(img_tag, base_url)
-                    if image_info and not self._is_duplicate_image(image_info, images):
-                        images.append(image_info)
-        
-        # 方法3: 直接查找所有img标签，过滤出商品图片
-        all_img_tags = soup.find_all('img')
-        for img_tag in all_img_tags:
-            src = img_tag.get('src')
-            if src and self._is_product_image(src):
+        swiper_images = []
+        container_images = []
+        product_images = []
+        
+        root = self._parse_html(html_content)
+        if root is not None:
+            swiper_first_imgs = set(_SWIPER_FIRST_IMG_XPATH(root))
+            container_imgs = set(_IMAGE_CONTAINER_IMG_XPATH(root))
+            
+            for img_tag in root.iter('img'):
+                src = img_tag.get('src')
+                if not src:
+                    continue
+                in_swiper = img_tag in swiper_first_imgs
+                in_container = img_tag in container_imgs
+                is_product = self._is_product_image(src)
+                if not (in_swiper or in_container or is_product):
+                    continue
+                
+                # 同一个img可能属于多个来源，只创建一次ImageInfo
                 image_info = self._create_image_info(img_tag, base_url)
-                if image_info and not self._is_duplicate_image(image_info, images):
-                    images.append(image_info)
-        
-        # 方法4: 使用正则表达式从HTML源码中直接提取图片URL（适用于动态加载的页面）
+                if not image_info:
+                    continue
+                if in_swiper:
+                    swiper_images.append(image_info)
+                if in_container:
+                    container_images.append(image_info)
+                if is_product:
+                    product_images.append(image_info)
+        
+        # 轮播图片全部保留，其余来源按URL（去除参数）去重，用集合代替逐个比较
+        images = list(swiper_images)
+        seen_url_bases = {image_info.url_base for image_info in images}
         regex_images = self._extract_images_by_regex(html_content, base_url)
-        for image_info in regex_images:
-            if not self._is_duplicate_image(image_info, images):
+        for image_info in chain(container_images, product_images, regex_images):
+            url_base = image_info.url_base
+            if url_base not in seen_url_bases:
+                seen_url_bases.add(url_base)
                 images.append(image_info)
         
         # 去重并排序
@@ -192,12 +293,47 @@ class YouZanProductScraper:
         
         return unique_images
     
+    def _parse_html(self, html_content: str):
+        """
+        解析HTML为lxml元素树
+        
+        Args:
+            html_content: HTML内容
+            
+        Returns:
+            lxml根元素，内容为空或无法解析时返回None
+        """
+        if not html_content or not html_content.strip():
+            return None
+        parser = self._get_parser()
+        try:
+            return lxml.html.fromstring(html_content, parser=parser)
+        except ValueError:
+            # 带有编码声明的字符串需要以字节形式解析
+            return lxml.html.fromstring(html_content.encode('utf-8'), parser=parser)
+        except etree.ParserError as e:
+            logger.warning("解析HTML失败: %s", e)
+            return None
+    
+    def _get_parser(self) -> lxml.html.HTMLParser:
+        """
+        获取当前线程的HTML解析器，不保留注释和处理指令
+        
+        Returns:
+            lxml.html.HTMLParser: 解析器
+        """
+        parser = getattr(self._parsers, 'parser', None)
+        if parser is None:
+            parser = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+            self._parsers.parser = parser
+        return parser
+    
     def _create_image_info(self, img_tag, base_url: str) -> Optional[ImageInfo]:
         """
         从img标签创建ImageInfo对象
         
         Args:
-            img_tag: BeautifulSoup的img标签对象
+            img_tag: lxml的img元素
             base_url: 基础URL
             
         Returns:
@@ -220,11 +356,12 @@ class YouZanProductScraper:
             height = self._parse_dimension(img_tag.get('height'))
             
             # 从URL推断图片格式
-            format_match = re.search(r'\.(jpg|jpeg|png|webp|gif)(?:\?|$)', src.lower())
+            src_lower = src.lower()
+            format_match = _IMAGE_FORMAT_RE.search(src_lower)
             image_format = format_match.group(1) if format_match else 'jpg'
             
             # 从URL推断尺寸类型
-            size_type = self._infer_size_type(src)
+            size_type = self._infer_size_type(src, src_lower)
             
             return ImageInfo(
                 url=src,
@@ -236,7 +373,7 @@ class YouZanProductScraper:
             )
             
         except Exception as e:
-            logger.warning(f"创建图片信息失败: {str(e)}")
+            logger.warning("创建图片信息失败: %s", e)
             return None
     
     def _parse_dimension(self, dimension_str: Optional[str]) -> Optional[int]:
@@ -253,23 +390,29 @@ class YouZanProductScraper:
             return None
         
         try:
-            # 移除px等单位
-            clean_str = re.sub(r'[^0-9]', '', str(dimension_str))
+            dimension_str = str(dimension_str)
+            # 移除px等单位：ASCII字符串直接用转换表，避免调用正则引擎
+            if dimension_str.isascii():
+                clean_str = dimension_str.translate(_ASCII_NON_DIGIT_TABLE)
+            else:
+                clean_str = _NON_DIGIT_RE.sub('', dimension_str)
             return int(clean_str) if clean_str else None
         except (ValueError, TypeError):
             return None
     
-    def _infer_size_type(self, url: str) -> str:
+    def _infer_size_type(self, url: str, url_lower: Optional[str] = None) -> str:
         """
         从URL推断图片尺寸类型
         
         Args:
             url: 图片URL
+            url_lower: 调用方已计算好的小写URL（可选）
             
         Returns:
             str: 尺寸类型
         """
-        url_lower = url.lower()
+        if url_lower is None:
+            url_lower = url.lower()
         
         if any(keyword in url_lower for keyword in ['thumb', 'small', 's_']):
             return 'thumbnail'
@@ -277,9 +420,9 @@ class YouZanProductScraper:
             return 'medium'
         elif any(keyword in url_lower for keyword in ['large', 'l_', 'big']):
             return 'large'
-        elif re.search(r'/w/\d+', url) or re.search(r'w_\d+', url):
+        elif _WIDTH_PARAM_RE.search(url):
             # 检查是否有宽度参数，通常大尺寸图片会有较大的宽度值
-            width_match = re.search(r'(?:w[/_])(\d+)', url)
+            width_match = _WIDTH_VALUE_RE.search(url)
             if width_match:
                 width = int(width_match.group(1))
                 if width >= 750:
@@ -291,50 +434,29 @@ class YouZanProductScraper:
         
         return 'original'
     
-    def _is_product_image(self, src: str) -> bool:
+    def _is_product_image(self, src: str, src_lower: Optional[str] = None) -> bool:
         """
         判断是否为商品图片
         
         Args:
             src: 图片URL
+            src_lower: 调用方已计算好的小写URL（可选）
             
         Returns:
             bool: 是否为商品图片
         """
-        # 过滤掉明显不是商品图片的URL
-        exclude_patterns = [
-            r'logo',
-            r'icon',
-            r'avatar',
-            r'thumb',
-            r'banner',
-            r'/ad[_-]',  # 修复：只匹配路径中的ad，避免误匹配upload等词
-            r'advertisement',
-            r'placeholder',
-            r'loading',
-            r'default',
-            r'skeleton',  # 骨架屏图片
-            r'\.(svg)$',  # 通常logo和图标是SVG格式
-        ]
-        
-        src_lower = src.lower()
+        if src_lower is None:
+            src_lower = src.lower()
         
-        # 检查排除模式
-        for pattern in exclude_patterns:
-            if re.search(pattern, src_lower):
-                return False
-        
-        # 检查是否包含有赞CDN域名或常见图片格式
-        include_patterns = [
-            r'yzcdn\.cn',  # 有赞CDN (包括img01.yzcdn.cn等子域名)
-            r'youzan',     # 有赞相关
-        ]
+        # 过滤掉明显不是商品图片的URL（所有排除规则合并为一个正则）
+        if _EXCLUDE_IMAGE_RE.search(src_lower):
+            return False
         
         # 必须包含有赞相关域名
-        has_youzan_domain = any(re.search(pattern, src_lower) for pattern in include_patterns)
+        has_youzan_domain = _YOUZAN_DOMAIN_RE.search(src_lower) is not None
         
         # 检查是否有图片格式
-        has_image_format = re.search(r'\.(jpg|jpeg|png|webp)', src_lower)
+        has_image_format = _IMAGE_EXT_RE.search(src_lower)
         
         # 检查是否是商品图片路径（通常在upload_files目录下）
         is_upload_file = 'upload_files' in src_lower
@@ -354,15 +476,12 @@ class YouZanProductScraper:
         """
         for existing in existing_images:
             # 比较URL（去除参数）
-            new_url_base = new_image.url.split('?')[0]
-            existing_url_base = existing.url.split('?')[0]
-            
-            if new_url_base == existing_url_base:
+            if new_image.url_base == existing.url_base:
                 return True
         
         return False
     
-    def _extract_images_by_regex(self, html_content: str, base_url: str) -> List[ImageInfo]:
+    def _extract_images_by_regex(self, html_content: str, base_url: str) -> Iterator[ImageInfo]:
         """
         使用正则表达式从HTML源码中提取图片URL
         
@@ -370,47 +489,38 @@ class YouZanProductScraper:
             html_content: HTML内容
             base_url: 基础URL
             
-        Returns:
-            List[ImageInfo]: 图片信息列表
+        Yields:
+            ImageInfo: 图片信息，按在HTML中出现的顺序逐个生成
         """
-        images = []
-        
-        # 查找所有图片URL（包括相对协议URL）
-        patterns = [
-            r'https?://[^\s\"\'>]+\.(?:jpg|jpeg|png|webp)(?:\?[^\s\"\'>]*)?',  # 完整URL
-            r'//[^\s\"\'>]+\.(?:jpg|jpeg|png|webp)(?:\?[^\s\"\'>]*)?'  # 相对协议URL
-        ]
-        
-        all_urls = set()
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            all_urls.update(matches)
-        
-        full_urls = list(all_urls)
+        seen_urls = set()
         
-        for url in full_urls:
-            # 处理相对协议URL
-            if url.startswith('//'):
-                url = 'https:' + url
+        # 单次扫描查找所有图片URL（包括相对协议URL）
+        for match in _IMAGE_URL_RE.finditer(html_content):
+            scheme, relative_url = match.groups()
+            https_url = 'https:' + relative_url
+            # 带协议的URL保留原始写法，同时按https补全协议相对部分
+            urls = (match.group(0), https_url) if scheme else (https_url,)
             
-            # 过滤出图片URL
-            if re.search(r'\.(jpg|jpeg|png|webp)(?:\?|$)', url, re.IGNORECASE):
-                if self._is_product_image(url):
+            for url in urls:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                
+                # 每个URL只转换一次小写
+                url_lower = url.lower()
+                if self._is_product_image(url, url_lower):
                     # 创建ImageInfo对象
-                    format_match = re.search(r'\.(jpg|jpeg|png|webp)(?:\?|$)', url.lower())
+                    format_match = _IMAGE_URL_FORMAT_RE.search(url_lower)
                     image_format = format_match.group(1) if format_match else 'jpg'
                     
-                    size_type = self._infer_size_type(url)
+                    size_type = self._infer_size_type(url, url_lower)
                     
-                    image_info = ImageInfo(
+                    yield ImageInfo(
                         url=url,
                         alt_text="",
                         format=image_format,
                         size_type=size_type
                     )
-                    images.append(image_info)
-        
-        return images
     
     def _deduplicate_images(self, images: List[ImageInfo]) -> List[ImageInfo]:
         """
@@ -426,14 +536,13 @@ class YouZanProductScraper:
         unique_images = []
         
         for image in images:
-            url_base = image.url.split('?')[0]
+            url_base = image.url_base
             if url_base not in seen_urls:
                 seen_urls.add(url_base)
                 unique_images.append(image)
         
         # 按尺寸类型排序，优先显示大图
-        size_priority = {'large': 0, 'original': 1, 'medium': 2, 'thumbnail': 3}
-        unique_images.sort(key=lambda x: size_priority.get(x.size_type, 4))
+        unique_images.sort(key=attrgetter('priority'))
         
         return unique_images
     
@@ -447,15 +556,17 @@ class YouZanProductScraper:
         Returns:
             List[ImageInfo]: 高质量图片信息列表
         """
-        all_images = self.get_product_images(product_url)
-        
         # 过滤出高质量图片
-        high_quality_images = [
-            img for img in all_images 
-            if img.size_type in ['large', 'original', 'medium']
+        return [
+            img for img in self.get_product_images(product_url)
+            if img.size_type in _HIGH_QUALITY_SIZE_TYPES
         ]
-        
-        return high_quality_images
+    
+    @staticmethod
+    def clear_cache():
+        """清空页面HTML与图片提取结果缓存"""
+        _html_cache.clear()
+        _images_cache.clear()
     
     def close(self):
         """
@@ -471,27 +582,66 @@ class YouZanProductScraper:
 
 
 # 便捷函数
-def get_youzan_product_images(product_url: str, high_quality_only: bool = True) -> List[str]:
+def get_youzan_product_images(product_url: str, high_quality_only: bool = True,
+                              scraper: Optional[YouZanProductScraper] = None) -> List[str]:
     """
     便捷函数：获取有赞商品图片URLs
     
     Args:
         product_url: 商品详情页URL
         high_quality_only: 是否只返回高质量图片
+        scraper: 可复用的爬虫器（可选），传入时复用其会话且不会关闭
         
     Returns:
         List[str]: 图片URL列表
     """
+    if scraper is None:
+        with YouZanProductScraper() as scraper:
+            return get_youzan_product_images(product_url, high_quality_only, scraper)
+    
+    if high_quality_only:
+        images = scraper.get_high_quality_images(product_url)
+    else:
+        images = scraper.get_product_images(product_url)
+    
+    return [img.url for img in images]
+
+
+def get_many_youzan_product_images(product_urls: List[str], high_quality_only: bool = True,
+                                   max_workers: int = 8) -> List[List[str]]:
+    """
+    便捷函数：并发获取多个有赞商品的图片URLs
+    
+    所有请求共用同一个爬虫器的连接池，结果顺序与输入URL一致。
+    
+    Args:
+        product_urls: 商品详情页URL列表
+        high_quality_only: 是否只返回高质量图片
+        max_workers: 最大并发数
+        
+    Returns:
+        List[List[str]]: 每个商品对应的图片URL列表，获取失败的商品返回空列表
+    """
+    if not product_urls:
+        return []
+    
     with YouZanProductScraper() as scraper:
-        if high_quality_only:
-            images = scraper.get_high_quality_images(product_url)
-        else:
-            images = scraper.get_product_images(product_url)
+        fetch = scraper.get_high_quality_images if high_quality_only else scraper.get_product_images
         
-        return [img.url for img in images]
+        def fetch_urls(product_url: str) -> List[str]:
+            try:
+                return [img.url for img in fetch(product_url)]
+            except Exception:
+                # 错误已在get_product_images中记录，单个商品失败不影响其它商品
+                return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(product_urls))) as executor:
+            return list(executor.map(fetch_urls, product_urls))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # 测试代码
     test_url = "https://shop18443051.m.youzan.com/wscgoods/detail/3ngm8yx62rws3ji"
     
@@ -1,12 +1,14 @@
 import os
+import re
+import csv
 import json
-import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
+from importlib.util import find_spec
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterable
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
 
 # 导入所需的代理类
 from agents.wellness.wellness_mom_agent import WellnessMomAgent
@@ -18,7 +20,70 @@ from agents.product_recommender.product_recommender_agent import ProductRecommen
 from agents.product_recommendation_validator.product_recommendation_validator_agent import ProductRecommendationValidatorAgent
 from agents.content_rewriter.content_rewriter_agent import ContentRewriterAgent
 
-@dataclass
+# xlsxwriter 为可选依赖，未安装时使用 openpyxl 导出 Excel；只检查是否安装，导出时再导入
+_HAS_XLSXWRITER = find_spec("xlsxwriter") is not None
+
+# LLM 返回内容中的 ```json / ``` 代码块标记
+_CODE_FENCE_RE = re.compile(r"```(?:json)?")
+
+
+# Excel 导出的列标题（顺序即列顺序）
+_EXCEL_HEADERS = (
+    "用户输入", "人设详情", "场景内容", "场景验收结果", "场景验收原因",
+    "文案内容", "文案验收结果", "文案验收原因", "重写后文案",
+    "K3编码", "产品名称", "产品描述", "产品价格",
+    "商品推荐原因", "商品推荐成功", "商品推荐错误", "处理阶段", "最终状态", "创建时间"
+)
+
+# Excel 导出的列宽，未列出的列使用默认宽度 15
+_EXCEL_COLUMN_WIDTHS = {
+    "用户输入": 20,
+    "人设详情": 30,
+    "场景内容": 40,
+    "场景验收结果": 12,
+    "场景验收原因": 30,
+    "文案内容": 50,
+    "文案验收结果": 12,
+    "文案验收原因": 30,
+    "重写后文案": 50,
+    "K3编码": 15,
+    "产品名称": 25,
+    "产品描述": 40,
+    "产品价格": 12,
+    "商品推荐原因": 30,
+    "商品推荐成功": 12,
+    "商品推荐错误": 30,
+    "处理阶段": 15,
+    "最终状态": 12,
+    "创建时间": 20
+}
+
+# 数据字典为空时使用的只读空字典
+_EMPTY_MAPPING = MappingProxyType({})
+
+
+def strip_code_fence(text: str) -> str:
+    """去除 LLM 返回内容中的 ```json / ``` 代码块标记"""
+    return _CODE_FENCE_RE.sub("", text)
+
+
+@lru_cache(maxsize=1024)
+def _clean_excel_text(text: str, preserve_newlines: bool) -> str:
+    """清理导出到Excel的文本（纯函数，缓存处理阶段、人设等跨行重复的值）"""
+    if preserve_newlines:
+        # 保留换行符，只清理其他问题字符
+        text = text.replace('\r', '').replace('\t', ' ')  # 移除回车符（保留\n），制表符替换为空格
+        # 移除可能导致Excel解析问题的字符
+        text = text.replace('"', "'")  # 双引号替换为单引号
+        # 清理每行的多余空格，但保留换行结构
+        return '\n'.join([' '.join(line.split()) for line in text.split('\n')])
+    
+    # 移除所有换行符并清理多余空格（split() 已按 \n、\r、\t 等空白切分）
+    # 再将双引号替换为单引号，避免Excel解析问题
+    return ' '.join(text.split()).replace('"', "'")
+
+
+@dataclass(slots=True)
 class ContentItem:
     """文案数据项"""
     user_input: str = ""
@@ -55,8 +120,8 @@ class ContentItem:
             self.recommended_products = []
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return asdict(self)
+        """转换为字典格式（浅拷贝，嵌套的 dict/list 与实例共享，不要原地修改）"""
+        return {name: getattr(self, name) for name in _CONTENT_ITEM_FIELDS}
     
     def is_valid(self) -> bool:
         """检查是否为有效的文案数据（场景和内容都验收通过）"""
@@ -65,6 +130,10 @@ class ContentItem:
                 self.final_status == "success")
 
 
+# ContentItem 的字段名，供 to_dict 使用，避免 asdict 的递归深拷贝
+_CONTENT_ITEM_FIELDS = tuple(f.name for f in fields(ContentItem))
+
+
 class ContentCollector:
     """文案数据收集器"""
     
@@ -82,6 +151,15 @@ class ContentCollector:
         item = ContentItem(**kwargs)
         self.items.append(item)
     
+    def add_many(self, items: Iterable[ContentItem]) -> None:
+        """批量追加已构建好的内容项（一次 extend，避免逐个 append）"""
+        self.items.extend(items)
+    
+    def add_content_batch(self, items_kwargs: Iterable[Dict[str, Any]]) -> None:
+        """批量添加内容项，同一批次共用一个创建时间"""
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.items.extend(ContentItem(**{"created_at": created_at, **kwargs}) for kwargs in items_kwargs)
+    
     def add_scenario_only(self, user_input: str, persona_detail: str, 
                          scenario: str, scenario_validation_result: bool,
                          scenario_validation_reason: str) -> None:
@@ -99,24 +177,36 @@ class ContentCollector:
     
     def get_valid_items(self) -> List[ContentItem]:
         """获取验收通过的文案数据"""
-        return [item for item in self.items if item.is_valid()]
+        # 条件与 ContentItem.is_valid 一致，内联以省去逐项的方法调用
+        return [item for item in self.items
+                if item.scenario_validation_result
+                and item.content_validation_result
+                and item.final_status == "success"]
+    
+    def count_valid_items(self) -> int:
+        """统计验收通过的文案数据数量（不生成中间列表）"""
+        # 条件与 ContentItem.is_valid 一致，内联以省去逐项的方法调用
+        return sum(1 for item in self.items
+                   if item.scenario_validation_result
+                   and item.content_validation_result
+                   and item.final_status == "success")
     
     def clear(self) -> None:
         """清空所有数据"""
         self.items.clear()
     
-    def _get_original_content(self, item: ContentItem) -> str:
-        """获取原始文案内容"""
-        if not item.content_data:
+    def _get_original_content(self, content_data: Dict[str, Any]) -> str:
+        """从文案数据（ContentItem.content_data）中获取原始文案内容"""
+        if not content_data:
             return ""
         
         # 如果明确标记为重写且有original_content字段，使用original_content
-        if (item.content_data.get("rewritten", False) and 
-            "original_content" in item.content_data):
-            return item.content_data.get("original_content", "")
+        if (content_data.get("rewritten", False) and 
+            "original_content" in content_data):
+            return content_data.get("original_content", "")
         
         # 否则使用content作为原始文案
-        return item.content_data.get("content", "")
+        return content_data.get("content", "")
     
     def _clean_text_for_excel(self, text: str, preserve_newlines: bool = True) -> str:
         """清理文本，可选择是否保留换行符
@@ -129,29 +219,10 @@ class ContentCollector:
             return ""
         
         # 转换为字符串（防止非字符串类型）
-        text = str(text)
-        
-        if preserve_newlines:
-            # 保留换行符，只清理其他问题字符
-            text = text.replace('\r', '')  # 移除回车符（保留\n）
-            text = text.replace('\t', ' ')  # 制表符替换为空格
-            # 移除可能导致Excel解析问题的字符
-            text = text.replace('"', "'")  # 双引号替换为单引号
-            # 清理每行的多余空格，但保留换行结构
-            lines = text.split('\n')
-            cleaned_lines = [' '.join(line.split()) for line in lines]
-            text = '\n'.join(cleaned_lines)
-        else:
-            # 原有逻辑：移除所有换行符
-            text = text.replace('\n', ' ')  # 换行符替换为空格
-            text = text.replace('\r', ' ')  # 回车符替换为空格
-            text = text.replace('\t', ' ')  # 制表符替换为空格
-            # 清理多余的空格
-            text = ' '.join(text.split())
-            # 移除可能导致Excel解析问题的字符
-            text = text.replace('"', "'")  # 双引号替换为单引号
-        
-        return text
+        if not isinstance(text, str):
+            text = str(text)
+        
+        return _clean_excel_text(text, preserve_newlines)
     
     def __len__(self) -> int:
         """返回数据总数"""
@@ -161,117 +232,216 @@ class ContentCollector:
         """获取收集的数据总数（与 __len__ 功能相同）"""
         return len(self.items)
     
-    def export_to_excel(self, filename: str = None, preserve_newlines: bool = True) -> Optional[str]:
+    def export_to_excel(self, filename: str = None, preserve_newlines: bool = True,
+                        engine: Optional[str] = None) -> Optional[str]:
         """导出数据到Excel文件，支持保留换行符
         
         Args:
             filename: Excel文件名，如果为None则自动生成
             preserve_newlines: 是否保留换行符，默认为True
+            engine: 写入引擎，"xlsxwriter" 或 "openpyxl"；为None时安装了 xlsxwriter 则优先使用
         """
         if not self.items:
             return None
         
+        if engine is None:
+            engine = "xlsxwriter" if _HAS_XLSXWRITER else "openpyxl"
+        if engine not in ("xlsxwriter", "openpyxl"):
+            print(f"导出Excel失败: 不支持的引擎 {engine}")
+            return None
+        if engine == "xlsxwriter" and not _HAS_XLSXWRITER:
+            print("导出Excel失败: 未安装 xlsxwriter")
+            return None
+        
         if filename is None:
-            if self.k3_code:
-                # 优先使用K3编码作为文件名
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{self.k3_code}_{timestamp}.xlsx"
-            else:
-                # 如果没有K3编码，则使用原来的时间戳方式
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{timestamp}.xlsx"
+            filename = self._default_filename(".xlsx")
         
         filepath = os.path.join(self.output_dir, filename)
         
         try:
-            # 创建工作簿和工作表
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "文案数据"
+            # xlsxwriter 以 constant_memory 模式逐行流式写入，openpyxl 使用只写模式
+            if engine == "xlsxwriter":
+                self._export_with_xlsxwriter(filepath, preserve_newlines)
+            else:
+                self._export_with_openpyxl(filepath, preserve_newlines)
+            return filepath
             
-            # 定义列标题和顺序
-            headers = [
-                "用户输入", "人设详情", "场景内容", "场景验收结果", "场景验收原因",
-                "文案内容", "文案验收结果", "文案验收原因", "重写后文案",
-                "K3编码", "产品名称", "产品描述", "产品价格",
-                "商品推荐原因", "商品推荐成功", "商品推荐错误", "处理阶段", "最终状态", "创建时间"
-            ]
+        except Exception as e:
+            print(f"导出Excel失败: {str(e)}")
+            return None
+    
+    def export_to_csv(self, filename: str = None, preserve_newlines: bool = True) -> Optional[str]:
+        """导出数据到CSV文件（无样式，比Excel快得多，适合大量数据或后续分析）
+        
+        Args:
+            filename: CSV文件名，如果为None则自动生成
+            preserve_newlines: 是否保留换行符，默认为True
+        """
+        if not self.items:
+            return None
+        
+        if filename is None:
+            filename = self._default_filename(".csv")
+        
+        filepath = os.path.join(self.output_dir, filename)
+        
+        try:
+            # utf-8-sig 带BOM，便于Excel直接打开中文内容；逐行写入，不在内存中保留全部数据
+            with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(_EXCEL_HEADERS)
+                for item in self.items:
+                    writer.writerow(self._prepare_row_values(item, preserve_newlines))
+            return filepath
             
-            # 设置标题行样式
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_alignment = Alignment(horizontal="center", vertical="center")
+        except Exception as e:
+            print(f"导出CSV失败: {str(e)}")
+            return None
+    
+    def _default_filename(self, extension: str) -> str:
+        """生成默认导出文件名，优先使用K3编码作为前缀，否则仅使用时间戳
+        
+        时间戳精确到微秒并附带进程号，避免并发运行的多个工作流写入同一目录时互相覆盖
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        suffix = f"{timestamp}_{os.getpid()}{extension}"
+        if self.k3_code:
+            return f"{self.k3_code}_{suffix}"
+        return suffix
+    
+    def _export_with_xlsxwriter(self, filepath: str, preserve_newlines: bool = True) -> None:
+        """使用 xlsxwriter 的 constant_memory 模式逐行写入，内存占用与行数无关"""
+        # 仅在此处用到 xlsxwriter，延迟导入以减少工作流启动时间
+        import xlsxwriter
+        
+        wb = xlsxwriter.Workbook(filepath, {'constant_memory': True, 'strings_to_urls': False})
+        try:
+            ws = wb.add_worksheet("文案数据")
+            header_format = wb.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+                'align': 'center', 'valign': 'vcenter'
+            })
+            content_format = wb.add_format({
+                'font_size': 10, 'align': 'left', 'valign': 'top', 'text_wrap': True
+            })
             
-            # 写入标题行
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_idx, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
+            # constant_memory 模式下列宽、行高需在写入数据前设置
+            for col_idx, header in enumerate(_EXCEL_HEADERS):
+                ws.set_column(col_idx, col_idx, _EXCEL_COLUMN_WIDTHS.get(header, 15))
+            ws.write_row(0, 0, _EXCEL_HEADERS, header_format)
             
-            # 定义内容样式
-            content_font = Font(size=10)
-            content_alignment = Alignment(
+            for row_idx, item in enumerate(self.items, 1):
+                row_values = self._prepare_row_values(item, preserve_newlines)
+                if preserve_newlines:
+                    height = self._get_row_height(row_values)
+                    if height:
+                        ws.set_row(row_idx, height)
+                ws.write_row(row_idx, 0, row_values, content_format)
+        finally:
+            wb.close()
+    
+    def _export_with_openpyxl(self, filepath: str, preserve_newlines: bool = True) -> None:
+        """使用 openpyxl 只写模式逐行写入（未安装 xlsxwriter 时使用）"""
+        # 仅在此处用到 openpyxl，延迟导入以减少工作流启动时间
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill, NamedStyle
+        
+        # 只写模式的工作簿不会在内存中保留已写入的行
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("文案数据")
+        
+        # 标题行与内容行样式注册为命名样式，单元格只需按名称引用
+        # （命名样式注册时绑定到工作簿，因此每次导出重新创建）
+        wb.add_named_style(NamedStyle(
+            name="content_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center")
+        ))
+        wb.add_named_style(NamedStyle(
+            name="content_body",
+            font=Font(size=10),
+            alignment=Alignment(
                 horizontal="left", 
                 vertical="top", 
                 wrap_text=True  # 启用自动换行
             )
+        ))
+        
+        # 只写模式下列宽、行高需在写入对应行之前设置
+        self._adjust_column_widths(ws, _EXCEL_HEADERS)
+        
+        # 写入标题行
+        header_row = []
+        for header in _EXCEL_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = "content_header"
+            header_row.append(cell)
+        ws.append(header_row)
+        
+        # 写入数据行
+        for row_idx, item in enumerate(self.items, 2):
+            row_values = self._prepare_row_values(item, preserve_newlines)
             
-            # 写入数据行
-            for row_idx, item in enumerate(self.items, 2):
-                # 准备行数据
-                row_data = self._prepare_row_data(item, preserve_newlines)
-                
-                # 写入每个单元格
-                for col_idx, header in enumerate(headers, 1):
-                    cell_value = row_data.get(header, "")
-                    cell = ws.cell(row=row_idx, column=col_idx, value=cell_value)
-                    cell.font = content_font
-                    cell.alignment = content_alignment
-                    
-                    # 对于包含换行符的单元格，调整行高
-                    if preserve_newlines and cell_value and '\n' in str(cell_value):
-                        line_count = str(cell_value).count('\n') + 1
-                        # 根据行数调整行高（每行约15像素）
-                        ws.row_dimensions[row_idx].height = max(20, line_count * 15)
-            
-            # 调整列宽
-            self._adjust_column_widths(ws, headers)
-            
-            # 保存文件
-            wb.save(filepath)
-            return filepath
+            # 对于包含换行符的单元格，调整行高
+            if preserve_newlines:
+                height = self._get_row_height(row_values)
+                if height:
+                    ws.row_dimensions[row_idx].height = height
             
-        except Exception as e:
-            print(f"导出Excel失败: {str(e)}")
-            return None
+            row = []
+            for cell_value in row_values:
+                cell = WriteOnlyCell(ws, value=cell_value)
+                cell.style = "content_body"
+                row.append(cell)
+            ws.append(row)
+        
+        # 保存文件
+        wb.save(filepath)
+    
+    @staticmethod
+    def _get_row_height(row_values) -> Optional[int]:
+        """计算行高（每行约15像素），无换行时返回None
+        
+        与原先逐个单元格设置行高的结果一致：以该行最后一个包含换行符的单元格为准
+        """
+        for value in reversed(row_values):
+            if value and '\n' in value:
+                return max(20, (value.count('\n') + 1) * 15)
+        return None
     
-    def _prepare_row_data(self, item: ContentItem, preserve_newlines: bool = True) -> Dict[str, str]:
-        """准备单行数据"""
+    def _prepare_row_values(self, item: ContentItem, preserve_newlines: bool = True) -> tuple:
+        """准备单行数据，按 _EXCEL_HEADERS 的列顺序返回"""
         # 解析推荐商品信息
         product_name, product_description, product_price = self._parse_product_info(item, preserve_newlines)
+        clean = self._clean_text_for_excel
+        # 各数据字典只读取一次，为空时使用只读空字典
+        scenario_data = item.scenario_data or _EMPTY_MAPPING
+        content_data = item.content_data or _EMPTY_MAPPING
+        content_validation_data = item.content_validation_data or _EMPTY_MAPPING
         
-        return {
-            "用户输入": self._clean_text_for_excel(item.user_input, preserve_newlines),
-            "人设详情": self._clean_text_for_excel(item.persona_detail, preserve_newlines),
-            "场景内容": self._clean_text_for_excel(item.scenario_data.get("content", "") if item.scenario_data else "", preserve_newlines),
-            "场景验收结果": "通过" if item.scenario_validation_result else "未通过",
-            "场景验收原因": self._clean_text_for_excel(item.scenario_validation_reason, preserve_newlines),
-            "文案内容": self._clean_text_for_excel(self._get_original_content(item), preserve_newlines),
-            "文案验收结果": "通过" if item.content_validation_result else "未通过",
-            "文案验收原因": self._clean_text_for_excel(item.content_validation_data.get("validation_reason", "") if item.content_validation_data else "", preserve_newlines),
-            "重写后文案": self._clean_text_for_excel(item.content_data.get("content", "") if item.content_data else "", preserve_newlines),
-            "K3编码": self._clean_text_for_excel(item.k3_code, preserve_newlines),
-            "产品名称": product_name,
-            "产品描述": product_description,
-            "产品价格": product_price,
-            "商品推荐原因": self._clean_text_for_excel(item.product_recommendation_reason, preserve_newlines),
-            "商品推荐成功": "是" if item.product_recommendation_success else "否",
-            "商品推荐错误": self._clean_text_for_excel(item.product_recommendation_error, preserve_newlines),
-            "处理阶段": self._clean_text_for_excel(item.processing_stage, preserve_newlines),
-            "最终状态": self._clean_text_for_excel(item.final_status, preserve_newlines),
-            "创建时间": self._clean_text_for_excel(item.created_at, preserve_newlines)
-        }
+        return (
+            clean(item.user_input, preserve_newlines),
+            clean(item.persona_detail, preserve_newlines),
+            clean(scenario_data.get("content", ""), preserve_newlines),
+            "通过" if item.scenario_validation_result else "未通过",
+            clean(item.scenario_validation_reason, preserve_newlines),
+            clean(self._get_original_content(content_data), preserve_newlines),
+            "通过" if item.content_validation_result else "未通过",
+            clean(content_validation_data.get("validation_reason", ""), preserve_newlines),
+            clean(content_data.get("content", ""), preserve_newlines),
+            clean(item.k3_code, preserve_newlines),
+            product_name,
+            product_description,
+            product_price,
+            clean(item.product_recommendation_reason, preserve_newlines),
+            "是" if item.product_recommendation_success else "否",
+            clean(item.product_recommendation_error, preserve_newlines),
+            clean(item.processing_stage, preserve_newlines),
+            clean(item.final_status, preserve_newlines),
+            clean(item.created_at, preserve_newlines)
+        )
     
     def _parse_product_info(self, item: ContentItem, preserve_newlines: bool = True) -> tuple:
         """解析商品信息，返回(产品名称, 产品描述, 产品价格)"""
@@ -285,25 +455,10 @@ class ContentCollector:
         
         # 如果product_name为空，则从recommended_products解析
         if not product_name and item.recommended_products:
-            if isinstance(item.recommended_products, str):
-                try:
-                    product_data = json.loads(item.recommended_products)
-                    if isinstance(product_data, dict):
-                        product_name = self._clean_text_for_excel(str(product_data.get('name', '')), preserve_newlines)
-                        product_description = self._clean_text_for_excel(str(product_data.get('description', product_data.get('desc', ''))), preserve_newlines)
-                        product_price = self._clean_text_for_excel(str(product_data.get('price', '')), preserve_newlines)
-                except (json.JSONDecodeError, AttributeError):
-                    product_name = self._clean_text_for_excel(str(item.recommended_products), preserve_newlines)
-            elif isinstance(item.recommended_products, dict):
-                product_name = self._clean_text_for_excel(str(item.recommended_products.get('name', '')), preserve_newlines)
-                product_description = self._clean_text_for_excel(str(item.recommended_products.get('description', item.recommended_products.get('desc', ''))), preserve_newlines)
-                product_price = self._clean_text_for_excel(str(item.recommended_products.get('price', '')), preserve_newlines)
-            elif isinstance(item.recommended_products, list) and len(item.recommended_products) > 0:
-                first_product = item.recommended_products[0]
-                if isinstance(first_product, dict):
-                    product_name = self._clean_text_for_excel(str(first_product.get('name', '')), preserve_newlines)
-                    product_description = self._clean_text_for_excel(str(first_product.get('description', first_product.get('desc', ''))), preserve_newlines)
-                    product_price = self._clean_text_for_excel(str(first_product.get('price', '')), preserve_newlines)
+            name, description, price = self._extract_product_fields(item.recommended_products)
+            product_name = self._clean_text_for_excel(name, preserve_newlines)
+            product_description = self._clean_text_for_excel(description, preserve_newlines)
+            product_price = self._clean_text_for_excel(price, preserve_newlines)
         
         # 如果仍然为空，使用ContentItem中的其他字段
         if not product_name:
@@ -315,33 +470,35 @@ class ContentCollector:
         
         return product_name, product_description, product_price
     
+    @staticmethod
+    def _extract_product_fields(recommended_products: Any) -> tuple:
+        """从推荐商品数据（JSON字符串/字典/列表）中提取(产品名称, 产品描述, 产品价格)，未清理"""
+        product_data = recommended_products
+        if isinstance(product_data, str):
+            try:
+                product_data = json.loads(product_data)
+            except json.JSONDecodeError:
+                # 非 JSON 字符串整体作为产品名称
+                return recommended_products, "", ""
+        elif isinstance(product_data, list):
+            # 列表取第一个商品
+            product_data = product_data[0] if product_data else None
+        
+        if not isinstance(product_data, dict):
+            return "", "", ""
+        return (
+            str(product_data.get('name', '')),
+            str(product_data.get('description', product_data.get('desc', ''))),
+            str(product_data.get('price', ''))
+        )
+    
     def _adjust_column_widths(self, ws, headers):
         """调整列宽"""
-        column_widths = {
-            "用户输入": 20,
-            "人设详情": 30,
-            "场景内容": 40,
-            "场景验收结果": 12,
-            "场景验收原因": 30,
-            "文案内容": 50,
-            "文案验收结果": 12,
-            "文案验收原因": 30,
-            "重写后文案": 50,
-            "K3编码": 15,
-            "产品名称": 25,
-            "产品描述": 40,
-            "产品价格": 12,
-            "商品推荐原因": 30,
-            "商品推荐成功": 12,
-            "商品推荐错误": 30,
-            "处理阶段": 15,
-            "最终状态": 12,
-            "创建时间": 20
-        }
+        from openpyxl.utils import get_column_letter
         
         for col_idx, header in enumerate(headers, 1):
             column_letter = get_column_letter(col_idx)
-            width = column_widths.get(header, 15)
+            width = _EXCEL_COLUMN_WIDTHS.get(header, 15)
             ws.column_dimensions[column_letter].width = width
 
 
@@ -351,6 +508,8 @@ class BaseWellnessWorkflow:
     def __init__(self, persona_detail: str, agent_config: Dict[str, Any] = None):
         self.persona_detail = persona_detail
         self.agent_config = agent_config or {}
+        # 各代理调用共用的人设输入，只构建一次
+        self._persona_inputs = {"persona": persona_detail, "persona_detail": persona_detail}
         
         # 从agent_config中获取必要的参数
         wellness_config = self.agent_config.get("wellness_agent", {})
@@ -421,19 +580,24 @@ class BaseWellnessWorkflow:
                 }
                 return result
             
-            # 6. 验证商品推荐
-            product_validation = self._validate_product_recommendation(
-                recommended_product["product"], 
-                content_validation["content"], 
-                scenario
-            )
-            
-            # 7. 重写内容以包含推荐商品
-            rewritten_content = self._rewrite_content_with_product(
-                content_validation["content"], 
-                recommended_product["product"],
-                scenario
-            )
+            # 6-7. 验证商品推荐与重写内容互不依赖，验证放在线程中与重写并行执行；
+            # 离开 with 块时等待验证线程结束，重写抛出异常时也不会遗留任务
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # 6. 验证商品推荐
+                validation_future = executor.submit(
+                    self._validate_product_recommendation,
+                    recommended_product["product"], 
+                    content_validation["content"], 
+                    scenario
+                )
+                
+                # 7. 重写内容以包含推荐商品
+                rewritten_content = self._rewrite_content_with_product(
+                    content_validation["content"], 
+                    recommended_product["product"],
+                    scenario
+                )
+                product_validation = validation_future.result()
             
             # 8. 准备最终结果
             result["success"] = True
@@ -456,8 +620,7 @@ class BaseWellnessWorkflow:
             # 使用场景生成代理（process接口）创建场景
             resp = self.scenario_generator.process({
                 "query": user_input,
-                "persona": self.persona_detail,
-                "persona_detail": self.persona_detail
+                **self._persona_inputs
             })
             if resp.success:
                 return resp.content
@@ -474,8 +637,7 @@ class BaseWellnessWorkflow:
                 "query": "请验收该场景是否合理且可执行",
                 "scenario_to_validate": scenario,
                 "user_input": user_input,
-                "persona": self.persona_detail,
-                "persona_detail": self.persona_detail
+                **self._persona_inputs
             })
             return {"valid": resp.success, "reason": resp.error_message or ""}
         except Exception as e:
@@ -489,8 +651,7 @@ class BaseWellnessWorkflow:
             resp = self.content_generator.process({
                 "query": user_input,
                 "scenario_content": scenario,
-                "persona": self.persona_detail,
-                "persona_detail": self.persona_detail,
+                **self._persona_inputs,
                 "answer": ""
             })
             if resp.success:
@@ -514,8 +675,7 @@ class BaseWellnessWorkflow:
                     "query": "请验收以下文案是否符合场景、人设和规范",
                     "content_to_validate": current_content,
                     "scenario": scenario_for_validator,
-                    "persona": self.persona_detail,
-                    "persona_detail": self.persona_detail,
+                    **self._persona_inputs,
                     "answer": ""
                 })
                 if resp.success:
@@ -568,8 +728,7 @@ class BaseWellnessWorkflow:
                 "recommendation_to_validate": product,
                 "content": content,
                 "scenario": scenario,
-                "persona": self.persona_detail,
-                "persona_detail": self.persona_detail
+                **self._persona_inputs
             })
             return {"valid": resp.success, "reason": resp.error_message or ""}
         except Exception as e:
@@ -3,7 +3,7 @@
 """
 运行所有工作流脚本
 
-这个脚本依次执行三个工作流：
+这个脚本并发执行三个工作流（使用 --sequential 参数时按顺序执行）：
 1. sunian-girl/sunian.py - 素年养生工作流
 2. wellnessmom/wellness_workflow.py - 养生妈妈工作流  
 3. workmen/workmen.py - 职场生存优化师工作流
@@ -14,9 +14,11 @@
 
 import sys
 import os
+import argparse
 import subprocess
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
@@ -137,25 +139,40 @@ class WorkflowRunner:
                 'returncode': -1
             }
     
-    def run_all_workflows(self) -> List[Dict[str, Any]]:
-        """运行所有工作流"""
+    def run_all_workflows(self, sequential: bool = False) -> List[Dict[str, Any]]:
+        """运行所有工作流
+        
+        Args:
+            sequential: 为True时按顺序逐个运行（旧行为），默认并发运行
+        """
         logger.info("=" * 60)
         logger.info("开始运行所有工作流")
         logger.info("=" * 60)
         
         total_start_time = time.time()
         
-        for i, workflow in enumerate(self.workflows, 1):
-            logger.info(f"\n[{i}/{len(self.workflows)}] 准备运行: {workflow['name']}")
-            logger.info("-" * 40)
-            
-            result = self.run_single_workflow(workflow)
-            self.results.append(result)
+        if sequential:
+            for i, workflow in enumerate(self.workflows, 1):
+                logger.info(f"\n[{i}/{len(self.workflows)}] 准备运行: {workflow['name']}")
+                logger.info("-" * 40)
+                
+                result = self.run_single_workflow(workflow)
+                self.results.append(result)
+                
+                # 在工作流之间添加短暂延迟
+                if i < len(self.workflows):
+                    logger.info("等待3秒后继续下一个工作流...")
+                    time.sleep(3)
+        else:
+            for i, workflow in enumerate(self.workflows, 1):
+                logger.info(f"[{i}/{len(self.workflows)}] 准备运行: {workflow['name']}")
             
-            # 在工作流之间添加短暂延迟
-            if i < len(self.workflows):
-                logger.info("等待3秒后继续下一个工作流...")
-                time.sleep(3)
+            # 各工作流在独立子进程中运行、互不依赖，使用线程池并发等待，总耗时取决于最慢的一个
+            with ThreadPoolExecutor(max_workers=len(self.workflows) or 1) as executor:
+                futures = [executor.submit(self.run_single_workflow, workflow) for workflow in self.workflows]
+                # 按工作流定义顺序收集结果
+                for future in futures:
+                    self.results.append(future.result())
         
         total_end_time = time.time()
         total_duration = total_end_time - total_start_time
@@ -193,9 +210,14 @@ class WorkflowRunner:
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="运行所有工作流")
+    parser.add_argument("--sequential", action="store_true",
+                        help="按顺序逐个运行工作流（默认并发运行）")
+    args = parser.parse_args()
+    
     try:
         runner = WorkflowRunner()
-        results = runner.run_all_workflows()
+        results = runner.run_all_workflows(sequential=args.sequential)
         
         # 根据执行结果设置退出码
         failed_count = sum(1 for result in results if not result['success'])
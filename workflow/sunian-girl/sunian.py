@@ -21,7 +21,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # 导入通用模块
-from workflow.base_workflow import ContentItem, ContentCollector
+from workflow.base_workflow import ContentItem, ContentCollector, strip_code_fence
 
 # 导入所有需要的agent
 from agents.wellness.wellness_mom_agent import WellnessMomAgent
@@ -55,6 +55,8 @@ class WellnessWorkflow:
         self.config = config
         self.product_db = ProductDatabase()
         self.persona_detail = persona_detail
+        # 日志中使用的人设预览，只截取一次
+        self._persona_preview = persona_detail[:100]
         self.product_k3_code = product_k3_code
         
         # 定义API配置
@@ -97,7 +99,7 @@ class WellnessWorkflow:
                 return WorkflowResult(False, {}, f"场景生成失败: {scenario_result.error_message}")
 
             print(f"scenario_result: {scenario_result.content}")
-            scenario_result.content = scenario_result.content.replace("```json", "").replace("```", "")
+            scenario_result.content = strip_code_fence(scenario_result.content)
 
             # array scenario  for scenario_result.content
             # scenario_result.content is already processed as newline-separated strings
@@ -129,7 +131,7 @@ class WellnessWorkflow:
                         continue
                     
                     print(f"✅ 场景验证API调用成功，解析结果...")
-                    scenario_result_content = scenario_validation_result.content.replace("```json", "").replace("```", "")
+                    scenario_result_content = strip_code_fence(scenario_validation_result.content)
                     print(f"📄 场景验证原始内容: {scenario_result_content}")
                     
                     try:
@@ -244,7 +246,7 @@ class WellnessWorkflow:
                             continue
                         
                         print(f"\ncontent_validation: {content_validation}")
-                        content_validation_json = json.loads(content_validation.content.replace("```json", "").replace("```", ""))
+                        content_validation_json = json.loads(strip_code_fence(content_validation.content))
                         content_validation_passed = content_validation_json.get("result", False)
                         content_validation_reason = content_validation_json.get("reason", "")
                         
@@ -306,7 +308,7 @@ class WellnessWorkflow:
                     
                     if product_result.success:
                         print(f"\n商品推荐成功: {product_result.content}")
-                        recommended_products = product_result.content.replace("```json", "").replace("```", "")
+                        recommended_products = strip_code_fence(product_result.content)
                         
                         # 解析JSON数据
                         try:
@@ -350,6 +352,7 @@ class WellnessWorkflow:
                         
                         # 保存原始文案
                         original_content = content_result.content
+                        original_len = len(original_content)
                         
                         # 准备商品信息用于重写
                         goods_info = ""
@@ -401,7 +404,7 @@ class WellnessWorkflow:
                         
                         # 使用文案重写大师重写文案
                         print(f"📝 准备重写文案: {original_content}")
-                        print(f"👤 重写参数 - 人设: {self.persona_detail[:100]}...")
+                        print(f"👤 重写参数 - 人设: {self._persona_preview}...")
                         print(f"🎬 重写参数 - 场景: {scenario}")
                         print(f"🛍️ 重写参数 - 商品信息: {goods_info[:200]}..." if goods_info else "🛍️ 重写参数 - 商品信息: 无")
                         
@@ -417,7 +420,8 @@ class WellnessWorkflow:
                         if rewrite_result.success:
                             print(f"✅ 文案重写成功!")
                             print(f"📝 重写后文案内容: {rewrite_result.content}")
-                            print(f"📊 文案长度变化: {len(original_content)} → {len(rewrite_result.content)}")
+                            rewrite_len = len(rewrite_result.content)
+                            print(f"📊 文案长度变化: {original_len} → {rewrite_len}")
                             
                             # 使用重写后的文案
                             content_result = rewrite_result
@@ -437,10 +441,11 @@ class WellnessWorkflow:
                         
                         # 保存原始文案
                         original_content = content_result.content
+                        original_len = len(original_content)
                         
                         # 使用文案重写大师重写文案（不传入商品信息）
                         print(f"📝 准备重写文案: {original_content}")
-                        print(f"👤 重写参数 - 人设: {self.persona_detail[:100]}...")
+                        print(f"👤 重写参数 - 人设: {self._persona_preview}...")
                         print(f"🎬 重写参数 - 场景: {scenario}")
                         
                         rewrite_result = self.content_rewriter.process({
@@ -452,7 +457,8 @@ class WellnessWorkflow:
                         if rewrite_result.success:
                             print(f"✅ 文案重写成功!")
                             print(f"📝 重写后文案内容: {rewrite_result.content}")
-                            print(f"📊 文案长度变化: {len(original_content)} → {len(rewrite_result.content)}")
+                            rewrite_len = len(rewrite_result.content)
+                            print(f"📊 文案长度变化: {original_len} → {rewrite_len}")
                             
                             # 使用重写后的文案
                             content_result = rewrite_result
@@ -475,7 +481,7 @@ class WellnessWorkflow:
                             "original_content": original_content,
                             "rewrite_reason": "强制重写处理"
                         })
-                        print(f"📋 记录重写信息: 原始长度={len(original_content)}, 重写后长度={len(content_result.content)}")
+                        print(f"📋 记录重写信息: 原始长度={original_len}, 重写后长度={rewrite_len}")
                     
                     
                     self.content_collector.add_content(
@@ -561,7 +567,7 @@ class WellnessWorkflow:
         Returns:
             int: 验收通过的数据数量
         """
-        return len(self.content_collector.get_valid_items())
+        return self.content_collector.count_valid_items()
     
     def clear_collected_content(self) -> None:
         """清空已收集的文案数据"""
@@ -580,7 +586,7 @@ class WellnessWorkflow:
             if product:
                 product_dict = product.to_dict()
                 # 获取图片信息
-                image_info = self.product_db.get_product_image(product.id)
+                image_info = self.product_db.get_product_image_info(product.product_id)
                 if image_info:
                     product_dict['image'] = image_info
                 return product_dict
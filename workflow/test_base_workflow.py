@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文案数据收集器（ContentCollector）测试文件
+
+只测试本地导出与批量添加功能，不调用 Dify API
+"""
+
+import csv
+import os
+import tempfile
+
+import pytest
+from openpyxl import load_workbook
+
+from workflow.base_workflow import ContentCollector, _EXCEL_HEADERS, _HAS_XLSXWRITER
+
+
+def _make_collector(output_dir: str) -> ContentCollector:
+    """创建包含两条数据的收集器"""
+    collector = ContentCollector(output_dir=output_dir, k3_code="21.13.97")
+    collector.add_content(
+        user_input="早上好\r\n今天  喝什么",
+        persona_detail="养生妈妈",
+        scenario_data={"content": "早餐\n养胃"},
+        scenario_validation_result=True,
+        content_data={"content": "重写后的\"文案\""},
+        content_validation_result=True,
+        recommended_products=[{"name": "红枣茶", "desc": "补气血", "price": 39}],
+        final_status="success",
+        created_at="2025-01-01 08:00:00",
+    )
+    collector.add_scenario_only("输入", "养生妈妈", "场景", False, "不符合人设")
+    return collector
+
+
+def test_export_to_csv():
+    """测试CSV导出：BOM、表头与行内容"""
+    print("\n=== CSV导出测试 ===")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        collector = _make_collector(output_dir)
+        filepath = collector.export_to_csv("content.csv")
+        print(f"导出文件: {filepath}")
+        assert filepath == os.path.join(output_dir, "content.csv")
+
+        with open(filepath, "rb") as f:
+            assert f.read(3) == b"\xef\xbb\xbf", "CSV 应以 UTF-8 BOM 开头"
+
+        with open(filepath, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0] == list(_EXCEL_HEADERS)
+        assert len(rows) == 3
+
+        first = dict(zip(_EXCEL_HEADERS, rows[1]))
+        assert first["用户输入"] == "早上好\n今天 喝什么"
+        assert first["场景内容"] == "早餐\n养胃"
+        assert first["重写后文案"] == "重写后的'文案'"
+        assert first["产品名称"] == "红枣茶"
+        assert first["产品描述"] == "补气血"
+        assert first["产品价格"] == "39"
+        assert first["场景验收结果"] == "通过"
+        assert first["最终状态"] == "success"
+
+        second = dict(zip(_EXCEL_HEADERS, rows[2]))
+        assert second["场景验收结果"] == "未通过"
+        assert second["场景验收原因"] == "不符合人设"
+        assert second["处理阶段"] == "scenario_only"
+
+        # 没有数据时不导出
+        collector.clear()
+        assert collector.export_to_csv("empty.csv") is None
+        assert not os.path.exists(os.path.join(output_dir, "empty.csv"))
+
+    print("CSV导出测试通过")
+
+
+def test_add_content_batch():
+    """测试批量添加：共用创建时间，保留调用方传入的创建时间"""
+    print("\n=== 批量添加测试 ===")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        collector = ContentCollector(output_dir=output_dir)
+        items_kwargs = [
+            {"user_input": "a"},
+            {"user_input": "b"},
+            {"user_input": "c", "created_at": "2024-12-31 23:59:59"},
+        ]
+        collector.add_content_batch(items_kwargs)
+
+        assert [item.user_input for item in collector.items] == ["a", "b", "c"]
+        assert collector.items[0].created_at
+        assert collector.items[0].created_at == collector.items[1].created_at
+        assert collector.items[2].created_at == "2024-12-31 23:59:59"
+        # 不修改调用方的参数字典
+        assert "created_at" not in items_kwargs[0]
+        print(f"批量创建时间: {collector.items[0].created_at}")
+
+    print("批量添加测试通过")
+
+
+def test_export_to_excel_engines():
+    """测试Excel导出引擎选择"""
+    print("\n=== Excel导出引擎测试 ===")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        collector = _make_collector(output_dir)
+
+        # openpyxl 引擎始终可用
+        filepath = collector.export_to_excel("openpyxl.xlsx", engine="openpyxl")
+        assert filepath == os.path.join(output_dir, "openpyxl.xlsx")
+        ws = load_workbook(filepath).active
+        assert ws.title == "文案数据"
+        assert [cell.value for cell in ws[1]] == list(_EXCEL_HEADERS)
+        assert ws.cell(row=2, column=1).value == "早上好\n今天 喝什么"
+        assert ws.cell(row=1, column=1).font.b
+        assert ws.cell(row=2, column=1).alignment.wrap_text
+        assert ws.row_dimensions[2].height == 30
+        print(f"openpyxl 导出: {filepath}")
+
+        # 不支持的引擎
+        assert collector.export_to_excel("unknown.xlsx", engine="unknown") is None
+        assert not os.path.exists(os.path.join(output_dir, "unknown.xlsx"))
+
+    print("Excel导出引擎测试通过")
+
+
+def test_export_to_excel_xlsxwriter():
+    """测试 xlsxwriter 引擎导出（默认引擎），与 openpyxl 引擎的输出一致"""
+    print("\n=== xlsxwriter 导出测试 ===")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        collector = _make_collector(output_dir)
+        filepath = collector.export_to_excel("xlsxwriter.xlsx", engine="xlsxwriter")
+
+        if not _HAS_XLSXWRITER:
+            # 未安装时强制使用 xlsxwriter 导出失败，其余检查跳过
+            assert filepath is None
+            pytest.skip("未安装 xlsxwriter，跳过 xlsxwriter 导出检查")
+
+        assert filepath == os.path.join(output_dir, "xlsxwriter.xlsx")
+        # 未指定引擎时默认使用 xlsxwriter
+        assert collector.export_to_excel("default.xlsx") == os.path.join(output_dir, "default.xlsx")
+
+        ws = load_workbook(filepath).active
+        assert ws.title == "文案数据"
+        assert [cell.value for cell in ws[1]] == list(_EXCEL_HEADERS)
+        assert ws.cell(row=2, column=1).value == "早上好\n今天 喝什么"
+        assert ws.cell(row=3, column=1).value == "输入"
+        assert ws.cell(row=1, column=1).font.b
+        assert ws.cell(row=2, column=1).alignment.wrap_text
+        assert ws.row_dimensions[2].height == 30
+        print(f"xlsxwriter 导出: {filepath}")
+
+    print("xlsxwriter 导出测试通过")
+
+
+def main():
+    """主测试函数"""
+    test_export_to_csv()
+    test_add_content_batch()
+    test_export_to_excel_engines()
+    try:
+        test_export_to_excel_xlsxwriter()
+    except pytest.skip.Exception as e:
+        print(f"跳过: {e}")
+    print("\n🎉 所有测试通过！")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,16 +18,18 @@ import os
 from pathlib import Path
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加项目根目录到Python路径（必须在导入本地模块之前）
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # 导入通用模块
-from workflow.base_workflow import ContentItem, ContentCollector
+from workflow.base_workflow import ContentItem, ContentCollector, strip_code_fence
 
 # 导入所有需要的agent
 from agents.wellness.wellness_mom_agent import WellnessMomAgent
@@ -60,6 +62,8 @@ class WellnessWorkflow:
         self.config = config
         self.product_db = ProductDatabase()
         self.persona_detail = persona_detail
+        # 日志中使用的人设预览，只截取一次
+        self._persona_preview = persona_detail[:100]
         self.product_k3_code = product_k3_code
         
         # 定义API配置
@@ -81,12 +85,32 @@ class WellnessWorkflow:
         # 初始化数据收集器
         self.content_collector = ContentCollector(k3_code=self.product_k3_code)
         
+        # 并发处理场景的最大线程数，同时也是同时进行的 Dify 调用上限（Dify 有速率限制）
+        self.max_concurrent_scenarios = 8
+        # 所有场景线程与推测任务共用的 Dify 调用并发限制，不依赖线程池大小
+        self._dify_semaphore = threading.BoundedSemaphore(self.max_concurrent_scenarios)
+        # 推测执行线程池：与场景/文案验证并行发起后续步骤。
+        # 每个场景同时最多有首次文案生成和一个推测流水线在运行，
+        # 另留余量给已开始、无法取消的过期流水线，避免它们拖慢其他场景
+        self.max_speculative_tasks = self.max_concurrent_scenarios * 3
+        self._speculative_executor = ThreadPoolExecutor(max_workers=self.max_speculative_tasks)
+        
         logger.info("养生妈妈工作流初始化完成")
     
+    def close(self) -> None:
+        """关闭推测执行线程池，取消尚未开始的任务"""
+        self._speculative_executor.shutdown(wait=False, cancel_futures=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def run_complete_workflow(self, user_input: str) -> WorkflowResult:
         """运行完整的工作流程"""
         try:
-            logger.info(f"开始执行完整工作流，用户输入: {user_input}")
+            logger.info("开始执行完整工作流，用户输入: %s", user_input)
             
             # 步骤1: 单人设处理
             # persona_result = self.wellness_mom.process({'query': user_input})
@@ -102,7 +126,7 @@ class WellnessWorkflow:
                 return WorkflowResult(False, {}, f"场景生成失败: {scenario_result.error_message}")
 
             print(f"scenario_result: {scenario_result.content}")
-            scenario_result.content = scenario_result.content.replace("```json", "").replace("```", "")
+            scenario_result.content = strip_code_fence(scenario_result.content)
 
             # array scenario  for scenario_result.content
             # scenario_result.content is already processed as newline-separated strings
@@ -110,431 +134,528 @@ class WellnessWorkflow:
             print(f"scenario_array: {scenario_array}")
 
             # 步骤2: 场景验证和处理
-            index = 0
-            for scenario in scenario_array:
-                index = index + 1
+            # 各场景之间相互独立，且每个场景都是 I/O 密集的 Dify 调用，使用线程池并发处理；
+            # 每个场景写入独立的收集器，结束后按原始场景顺序合并，保证导出顺序不变
+            collectors = [
+                ContentCollector(output_dir=self.content_collector.output_dir, k3_code=self.product_k3_code)
+                for _ in scenario_array
+            ]
+            if scenario_array:
+                max_workers = min(self.max_concurrent_scenarios, len(scenario_array))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self._process_scenario, index, user_input, scenario, collector)
+                        for index, (scenario, collector) in enumerate(zip(scenario_array, collectors), 1)
+                    ]
+                    for future in futures:
+                        future.result()
 
-                # if index > 1:
-                #     break
-                print(f"\n🔍 开始处理场景: {scenario}")
-                try:
-                    # 场景验证
-                    print(f"📋 正在进行场景验证...")
-                    scenario_validation_result = self.scenario_validator.process({"scene":scenario, "persona":self.persona_detail})
-                    if not scenario_validation_result.success:
-                        # 场景验证失败，记录错误
-                        print(f"❌ 场景验证API调用失败: {scenario_validation_result.error_message}")
-                        self.content_collector.add_scenario_only(
+            for collector in collectors:
+                self.content_collector.add_many(collector.items)
+
+
+         
+            # 整合所有结果
+            workflow_data = {
+                "persona": self.persona_detail,
+                "content_count": self.content_collector.get_count(),
+                "message": "文案收集完成"
+            }
+            
+            logger.info("完整工作流执行成功")
+            return WorkflowResult(True, workflow_data)
+            
+        except Exception as e:
+            logger.error("工作流执行异常: %s", e)
+            return WorkflowResult(False, {}, str(e))
+
+    def _call_agent(self, process, params: Dict[str, Any]):
+        """在 Dify 调用并发上限内调用 Agent 的 process 方法"""
+        with self._dify_semaphore:
+            return process(params)
+    
+    def _process_scenario(self, index: int, user_input: str, scenario: str, collector: ContentCollector) -> None:
+        """处理单个场景：场景验证 -> 文案生成/验证 -> 商品推荐 -> 文案重写，结果写入 collector
+        
+        多个场景并发处理时输出会交错，每行输出都带上场景序号 index 以便区分
+        """
+        tag = f"[场景{index}]"
+        print(f"\n{tag} 🔍 开始处理场景: {scenario}")
+        # 首次文案生成只依赖场景本身，与场景验证并行发起；场景验证未通过时丢弃该结果
+        first_content_future = self._speculative_executor.submit(
+            self._call_agent,
+            self.content_generator.process,
+            {
+                "query": scenario,
+                "suggestion": "无",
+                "persona": self.persona_detail,
+                "text": "无",
+            }
+        )
+        # 针对当前文案推测发起的商品推荐及文案重写
+        pipeline_future = None
+        try:
+            # 场景验证
+            print(f"{tag} 📋 正在进行场景验证...")
+            scenario_validation_result = self._call_agent(self.scenario_validator.process, {"scene":scenario, "persona":self.persona_detail})
+            if not scenario_validation_result.success:
+                # 场景验证失败，记录错误
+                print(f"{tag} ❌ 场景验证API调用失败: {scenario_validation_result.error_message}")
+                collector.add_scenario_only(
+                    user_input=user_input,
+                    persona_detail=self.persona_detail,
+                    scenario=scenario,
+                    scenario_validation_result=False,
+                    scenario_validation_reason=f"场景验证API调用失败: {scenario_validation_result.error_message}"
+                )
+                return
+            
+            print(f"{tag} ✅ 场景验证API调用成功，解析结果...")
+            scenario_result_content = strip_code_fence(scenario_validation_result.content)
+            print(f"{tag} 📄 场景验证原始内容: {scenario_result_content}")
+            
+            try:
+                scenario_result_json = json.loads(scenario_result_content)
+                scenario_validation_passed = scenario_result_json.get("result", False)
+                scenario_validation_reason = scenario_result_json.get("reason", "")
+                print(f"{tag} 🔍 解析结果 - 验证通过: {scenario_validation_passed}, 原因: {scenario_validation_reason}")
+            except json.JSONDecodeError as e:
+                print(f"{tag} ❌ JSON解析失败: {e}")
+                print(f"{tag} 📄 原始内容: {scenario_result_content}")
+                collector.add_scenario_only(
+                    user_input=user_input,
+                    persona_detail=self.persona_detail,
+                    scenario=scenario,
+                    scenario_validation_result=False,
+                    scenario_validation_reason=f"JSON解析失败: {e}"
+                )
+                return
+            
+            if not scenario_validation_passed:
+                # 场景验证未通过，记录失败原因
+                print(f"{tag} ❌ 场景验证失败: {scenario_validation_reason}")
+                collector.add_scenario_only(
+                    user_input=user_input,
+                    persona_detail=self.persona_detail,
+                    scenario=scenario,
+                    scenario_validation_result=False,
+                    scenario_validation_reason=scenario_validation_reason
+                )
+                return
+            
+            print(f"{tag} ✅ 场景验证通过: {scenario_validation_reason}")
+            print(f"{tag} 🚀 开始文案生成和验证流程...")
+            
+            # 文案生成和验证（带重试机制）
+            max_retries = 3
+            content_generation_success = False
+            content_result = None
+            content_validation_reason = ""
+            
+            for retry_count in range(max_retries):
+                print(f"\n{tag} === 文案生成尝试 {retry_count + 1}/{max_retries} ===")
+                if pipeline_future is not None:
+                    # 上一版文案未通过，丢弃其推测结果（尚未开始时直接取消）
+                    pipeline_future.cancel()
+                    pipeline_future = None
+                
+                # 文案生成
+                if retry_count == 0:
+                    # 第一次生成，使用与场景验证并行发起的文案生成结果
+                    print(f"{tag} 使用文案生成器进行首次生成")
+                    content_result = first_content_future.result()
+                else:
+                    # 重试时使用文案重写器，传入原文案和修改建议
+                    print(f"{tag} 使用文案重写器进行重写，建议: {content_validation_reason}")
+                    content_result = self._call_agent(self.content_generator.process, {
+                        "query": scenario, 
+                        "suggestion": content_validation_reason,     
+                        "persona": self.persona_detail,
+                        "text": content_result.content, 
+                    })
+                
+                if not content_result.success:
+                    # 文案生成失败
+                    print(f"{tag} 文案生成失败: {content_result.error_message}")
+                    if retry_count == max_retries - 1:  # 最后一次重试也失败
+                        collector.add_content(
                             user_input=user_input,
                             persona_detail=self.persona_detail,
-                            scenario=scenario,
-                            scenario_validation_result=False,
-                            scenario_validation_reason=f"场景验证API调用失败: {scenario_validation_result.error_message}"
+                            scenario_data={"content": scenario},
+                            scenario_validation_result=True,
+                            scenario_validation_reason=scenario_validation_reason,
+                            content_data={"content": ""},
+                            content_validation_data={"validation_reason": ""},
+                            content_validation_result=False,
+                            content_generation_success=False,
+                            content_generation_error=content_result.error_message,
+                            k3_code="",  # 空的K3编码
+                            processing_stage="content_generation",
+                            final_status="content_failed"
                         )
-                        continue
-                    
-                    print(f"✅ 场景验证API调用成功，解析结果...")
-                    scenario_result_content = scenario_validation_result.content.replace("```json", "").replace("```", "")
-                    print(f"📄 场景验证原始内容: {scenario_result_content}")
-                    
-                    try:
-                        scenario_result_json = json.loads(scenario_result_content)
-                        scenario_validation_passed = scenario_result_json.get("result", False)
-                        scenario_validation_reason = scenario_result_json.get("reason", "")
-                        print(f"🔍 解析结果 - 验证通过: {scenario_validation_passed}, 原因: {scenario_validation_reason}")
-                    except json.JSONDecodeError as e:
-                        print(f"❌ JSON解析失败: {e}")
-                        print(f"📄 原始内容: {scenario_result_content}")
-                        self.content_collector.add_scenario_only(
+                    continue
+                
+                print(f"{tag} 文案生成成功: {content_result.content}")
+                
+                # 商品推荐和文案重写只依赖文案内容，与文案验证并行发起；若文案被重新生成则丢弃该结果
+                pipeline_future = self._speculative_executor.submit(
+                    self._recommend_and_rewrite, scenario, content_result, tag
+                )
+                
+                # 文案验证
+                content_validation = self._call_agent(self.content_validator.process, {
+                    "query": "请验收这个养生文案是否符合要求",
+                    "content_to_validate": content_result.content,
+                    "persona": self.persona_detail,
+                    "scenario": scenario
+                })
+                if not content_validation.success:
+                    # 文案验证API调用失败
+                    print(f"{tag} 文案验证API调用失败: {content_validation.error_message}")
+                    if retry_count == max_retries - 1:  # 最后一次重试也失败
+                        collector.add_content(
                             user_input=user_input,
                             persona_detail=self.persona_detail,
-                            scenario=scenario,
-                            scenario_validation_result=False,
-                            scenario_validation_reason=f"JSON解析失败: {e}"
+                            scenario_data={"content": scenario},
+                            scenario_validation_result=True,
+                            scenario_validation_reason=scenario_validation_reason,
+                            content_data={"content": content_result.content},
+                            content_validation_data={"validation_reason": f"验证API调用失败: {content_validation.error_message}"},
+                            content_validation_result=False,
+                            k3_code="",  # 空的K3编码
+                            processing_stage="content_validation",
+                            final_status="validation_failed"
                         )
-                        continue
-                    
-                    if not scenario_validation_passed:
-                        # 场景验证未通过，记录失败原因
-                        print(f"❌ 场景验证失败: {scenario_validation_reason}")
-                        self.content_collector.add_scenario_only(
+                    continue
+                
+                print(f"\n{tag} content_validation: {content_validation}")
+                content_validation_json = json.loads(strip_code_fence(content_validation.content))
+                content_validation_passed = content_validation_json.get("result", False)
+                content_validation_reason = content_validation_json.get("reason", "")
+                
+                if content_validation_passed:
+                    # 文案验证通过，继续后续流程
+                    print(f"{tag} 文案验证通过: {content_result.content}")
+                    content_generation_success = True
+                    break
+                else:
+                    # 文案验证未通过
+                    print(f"{tag} 文案验证未通过 (尝试 {retry_count + 1}/{max_retries}): {content_validation_reason}")
+                    if retry_count == max_retries - 1:  # 最后一次重试也未通过
+                        collector.add_content(
                             user_input=user_input,
                             persona_detail=self.persona_detail,
-                            scenario=scenario,
-                            scenario_validation_result=False,
-                            scenario_validation_reason=scenario_validation_reason
+                            scenario_data={"content": scenario},
+                            scenario_validation_result=True,
+                            scenario_validation_reason=scenario_validation_reason,
+                            content_data={"content": content_result.content},
+                            content_validation_data={"validation_reason": content_validation_reason},
+                            content_validation_result=False,
+                            k3_code="",  # 空的K3编码
+                            processing_stage="content_validation",
+                            final_status="validation_failed"
                         )
-                        continue
-                    
-                    print(f"✅ 场景验证通过: {scenario_validation_reason}")
-                    print(f"🚀 开始文案生成和验证流程...")
-                    
-                    # 文案生成和验证（带重试机制）
-                    max_retries = 3
-                    content_generation_success = False
-                    content_result = None
-                    content_validation_reason = ""
-                    
-                    for retry_count in range(max_retries):
-                        print(f"\n=== 文案生成尝试 {retry_count + 1}/{max_retries} ===")
-                        
-                        # 文案生成
-                        if retry_count == 0:
-                            # 第一次生成，使用文案生成器
-                            print("使用文案生成器进行首次生成")
-                            content_result = self.content_generator.process(
-                                {
-                                    "query": scenario, 
-                                    "suggestion": "无",
-                                    "persona": self.persona_detail,
-                                    "text":"无",
-                                })
-                        else:
-                            # 重试时使用文案重写器，传入原文案和修改建议
-                            print(f"使用文案重写器进行重写，建议: {content_validation_reason}")
-                            content_result = self.content_generator.process({
-                                "query": scenario, 
-                                "suggestion": content_validation_reason,     
-                                "persona": self.persona_detail,
-                                "text": content_result.content, 
-                            })
-                        
-                        if not content_result.success:
-                            # 文案生成失败
-                            print(f"文案生成失败: {content_result.error_message}")
-                            if retry_count == max_retries - 1:  # 最后一次重试也失败
-                                self.content_collector.add_content(
-                                    user_input=user_input,
-                                    persona_detail=self.persona_detail,
-                                    scenario_data={"content": scenario},
-                                    scenario_validation_result=True,
-                                    scenario_validation_reason=scenario_validation_reason,
-                                    content_data={"content": ""},
-                                    content_validation_data={"validation_reason": ""},
-                                    content_validation_result=False,
-                                    content_generation_success=False,
-                                    content_generation_error=content_result.error_message,
-                                    k3_code="",  # 空的K3编码
-                                    processing_stage="content_generation",
-                                    final_status="content_failed"
-                                )
-                            continue
-                        
-                        print(f"文案生成成功: {content_result.content}")
-                        
-                        # 文案验证
-                        content_validation = self.content_validator.process({
-                            "query": "请验收这个养生文案是否符合要求",
-                            "content_to_validate": content_result.content,
-                            "persona": self.persona_detail,
-                            "scenario": scenario
-                        })
-                        if not content_validation.success:
-                            # 文案验证API调用失败
-                            print(f"文案验证API调用失败: {content_validation.error_message}")
-                            if retry_count == max_retries - 1:  # 最后一次重试也失败
-                                self.content_collector.add_content(
-                                    user_input=user_input,
-                                    persona_detail=self.persona_detail,
-                                    scenario_data={"content": scenario},
-                                    scenario_validation_result=True,
-                                    scenario_validation_reason=scenario_validation_reason,
-                                    content_data={"content": content_result.content},
-                                    content_validation_data={"validation_reason": f"验证API调用失败: {content_validation.error_message}"},
-                                    content_validation_result=False,
-                                    k3_code="",  # 空的K3编码
-                                    processing_stage="content_validation",
-                                    final_status="validation_failed"
-                                )
-                            continue
-                        
-                        print(f"\ncontent_validation: {content_validation}")
-                        content_validation_json = json.loads(content_validation.content.replace("```json", "").replace("```", ""))
-                        content_validation_passed = content_validation_json.get("result", False)
-                        content_validation_reason = content_validation_json.get("reason", "")
-                        
-                        if content_validation_passed:
-                            # 文案验证通过，继续后续流程
-                            print(f"文案验证通过: {content_result.content}")
-                            content_generation_success = True
-                            break
-                        else:
-                            # 文案验证未通过
-                            print(f"文案验证未通过 (尝试 {retry_count + 1}/{max_retries}): {content_validation_reason}")
-                            if retry_count == max_retries - 1:  # 最后一次重试也未通过
-                                self.content_collector.add_content(
-                                    user_input=user_input,
-                                    persona_detail=self.persona_detail,
-                                    scenario_data={"content": scenario},
-                                    scenario_validation_result=True,
-                                    scenario_validation_reason=scenario_validation_reason,
-                                    content_data={"content": content_result.content},
-                                    content_validation_data={"validation_reason": content_validation_reason},
-                                    content_validation_result=False,
-                                    k3_code="",  # 空的K3编码
-                                    processing_stage="content_validation",
-                                    final_status="validation_failed"
-                                )
-                    # if self.product_k3_code: 不为空，则直接使用此商品的信息，获取商品信息参考 本文件中的其它逻辑，如果
-                    # 为空则使用现在逻辑通过product_recommender来生成
+            # if self.product_k3_code: 不为空，则直接使用此商品的信息，获取商品信息参考 本文件中的其它逻辑，如果
+            # 为空则使用现在逻辑通过product_recommender来生成
 
 
-                    if self.product_k3_code:
-                        # 直接使用指定的K3编码获取商品信息
-                        product_info = self.product_db.get_product_by_k3_code(self.product_k3_code)
-                        if product_info:
-                            # 构造与推荐器相同格式的响应
-                            product_data = {"goods": product_info.to_dict()}
-                            product_result = type('AgentResponse', (), {
-                                'success': True,
-                                'content': json.dumps(product_data, ensure_ascii=False, indent=2),
-                                'error': None
-                            })()
-                        else:
-                            # 如果找不到商品，创建失败响应
-                            product_result = type('AgentResponse', (), {
-                                'success': False,
-                                'content': "",
-                                'error': f"未找到K3编码为 {self.product_k3_code} 的商品"
-                            })()
-                    else:
-                        # 使用推荐器获取商品
-                        product_result = self.product_recommender.process({
-                            "query": content_result.content,
-                        })
+            # 使用与文案验证并行发起的结果；若未发起（如文案生成失败）则在此同步执行
+            if pipeline_future is not None:
+                stage = pipeline_future.result()
+            else:
+                stage = self._recommend_and_rewrite(scenario, content_result, tag)
+            content_result = stage["content_result"]
+            original_content = stage["original_content"]
+            recommended_products = stage["recommended_products"]
+            product_success = stage["product_success"]
+            product_error = stage["product_error"]
+            product_recommendation_reason = stage["product_recommendation_reason"]
+            k3_code = stage["k3_code"]
+            product_name = stage["product_name"]
+            selling_points = stage["selling_points"]
+            formula_source = stage["formula_source"]
+            price = stage["price"]
+            
+            # 收集完整的文案数据
+            # 构建content_data，如果进行了重写，需要保存原始内容和重写标记
+            content_data = {"content": content_result.content}
+            
+            # 检查是否进行了重写（原始文案与最终文案不同）
+            if original_content != content_result.content:
+                content_data.update({
+                    "rewritten": True,
+                    "original_content": original_content,
+                    "rewrite_reason": "强制重写处理"
+                })
+                print(f"{tag} 📋 记录重写信息: 原始长度={stage['original_len']}, 重写后长度={stage['rewrite_len']}")
+            
+            
+            collector.add_content(
+                user_input=user_input,
+                persona_detail=self.persona_detail,
+                scenario_data={"content": scenario},
+                scenario_validation_result=True,
+                scenario_validation_reason=scenario_validation_reason,
+                content_data=content_data,
+                content_validation_data={"validation_reason": content_validation_reason},
+                content_validation_result=True,
+                recommended_products=recommended_products,
+                product_recommendation_reason=product_recommendation_reason,
+                product_recommendation_success=product_success,
+                product_recommendation_error=product_error,
+                k3_code=k3_code,  # 新增：传递K3编码
+                product_name=product_name,  # 新增：传递产品名称
+                product_selling_points=selling_points,  # 新增：传递商品卖点
+                formula_source=formula_source,  # 新增：传递配方出处
+                product_price=price,  # 新增：传递商品价格
+                processing_stage="completed",
+                final_status="success"
+            )
+            
+        except Exception as e:
+            # 处理过程中的异常
+            print(f"{tag} 处理场景时发生异常: {str(e)}")
+            collector.add_scenario_only(
+                user_input=user_input,
+                persona_detail=self.persona_detail,
+                scenario=scenario,
+                scenario_validation_result=False,
+                scenario_validation_reason=f"处理异常: {str(e)}"
+            )
+        finally:
+            # 场景验证未通过、解析异常等提前结束时，尚未开始的推测任务直接取消
+            first_content_future.cancel()
+            if pipeline_future is not None:
+                pipeline_future.cancel()
+    
+    def _recommend_and_rewrite(self, scenario: str, content_result, tag: str) -> Dict[str, Any]:
+        """商品推荐（或按K3编码取商品）并基于商品信息重写文案
+        
+        Args:
+            scenario: 场景内容
+            content_result: 文案生成结果
+            tag: 输出前缀，标识所属场景
+        
+        Returns:
+            Dict[str, Any]: 最终文案响应、原始文案及商品相关字段
+        """
+        # 商品详情仅在推荐成功时填充，先给出默认值
+        product_name = ""
+        price = ""
+        selling_points = ""
+        formula_source = ""
+        rewrite_len = 0
+        
+        if self.product_k3_code:
+            # 直接使用指定的K3编码获取商品信息
+            product_info = self.product_db.get_product_by_k3_code(self.product_k3_code)
+            if product_info:
+                # 构造与推荐器相同格式的响应
+                product_data = {"goods": product_info.to_dict()}
+                product_result = type('AgentResponse', (), {
+                    'success': True,
+                    'content': json.dumps(product_data, ensure_ascii=False, indent=2),
+                    'error': None
+                })()
+            else:
+                # 如果找不到商品，创建失败响应
+                product_result = type('AgentResponse', (), {
+                    'success': False,
+                    'content': "",
+                    'error': f"未找到K3编码为 {self.product_k3_code} 的商品"
+                })()
+        else:
+            # 使用推荐器获取商品
+            product_result = self._call_agent(self.product_recommender.process, {
+                "query": content_result.content,
+            })
 
-                 
-                    recommended_products = ""
-                    product_success = False
-                    product_error = ""
-                    # 初始化商品相关变量，确保在所有情况下都有定义
-                    product_recommendation_reason = ""
-                    k3_code = ""
-                    
-                    if product_result.success:
-                        print(f"\n商品推荐成功: {product_result.content}")
-                        recommended_products = product_result.content.replace("```json", "").replace("```", "")
-                        
-                        # 解析JSON数据
-                        try:
-                            product_data = json.loads(recommended_products)
-                            # 提取商品信息和推荐原因
-                            reason = product_data.get('reason', '')
-                            
-                            # 支持两种数据结构：goods_list（数组）或 goods（单个对象）
-                            # 由于现在只推荐单个商品，优先处理 goods 单个对象格式
-                            if 'goods' in product_data:
-                                # 新格式：goods 单个对象
-                                goods_obj = product_data.get('goods')
-                                if goods_obj and isinstance(goods_obj, dict):
-                                    # 提取K3编码
-                                    k3_code = goods_obj.get('k3_code', '')
-                            elif 'goods_list' in product_data:
-                                # 旧格式：goods_list 数组，取第一个商品
-                                goods_list = product_data.get('goods_list', [])
-                                if goods_list and len(goods_list) > 0:
-                                    first_good = goods_list[0]
-                                    if isinstance(first_good, dict):
-                                        k3_code = first_good.get('k3_code', '')
-                            
-                            product_recommendation_reason = reason
-                            
-                            # 将解析后的JSON数据格式化存储
-                            recommended_products = json.dumps(product_data, ensure_ascii=False, indent=2)
-                            print(f"解析商品推荐JSON: {product_data}")
-                            print(f"K3编码: {k3_code}")
-                            print(f"推荐原因: {product_recommendation_reason}")
-                        except json.JSONDecodeError as e:
-                            print(f"JSON解析失败: {e}, 原始数据: {recommended_products}")
-                            # 如果解析失败，保持原始字符串
-                            product_recommendation_reason = "JSON解析失败"
-                            k3_code = ""
-                        
-                        product_success = True
-                        
-                        # 商品推荐成功后，进行文案重写处理
-                        print(f"🔄 开始文案重写处理（基于推荐商品优化文案）")
-                        
-                        # 保存原始文案
-                        original_content = content_result.content
-                        
-                        # 准备商品信息用于重写
-                        goods_info = ""
-                        selling_points = ""
-                        formula_source = ""
-                        product_name = ""  # 添加产品名称变量
-                        price = ""  # 添加价格变量
-                        if recommended_products and recommended_products != "无推荐商品" and product_recommendation_reason != "JSON解析失败":
-                            try:
-                                goods_data = json.loads(recommended_products)
-                                # 处理单个商品，从goods对象中提取信息
-                                if isinstance(goods_data, dict) and 'goods' in goods_data:
-                                    goods_obj = goods_data['goods']
-                                    name = goods_obj.get('name', '未知商品')
-                                    product_name = name  # 保存产品名称
-                                    description = goods_obj.get('description', '无描述')
-                                    price = str(goods_obj.get('price', '未知价格'))  # 保存价格信息
-                                    # 添加新字段：产品卖点和配方出处
-                                    selling_points = goods_obj.get('product_selling_points', '').strip()
-                                    formula_source = goods_obj.get('formula_source', '').strip()
-                                    
-                                    # 构建完整的商品信息格式：名称-描述-价格-卖点-配方出处
-                                    goods_parts = [name, description, f"价格:{price}元"]
-                                    # if selling_points:
-                                    #     goods_parts.append(f"卖点:{selling_points}")
-                                    # if formula_source:
-                                    #     goods_parts.append(f"配方:{formula_source}")
-                                    
-                                    goods_info = "-".join(goods_parts)  # 单个商品信息
-                                elif isinstance(goods_data, dict):
-                                    # 兼容旧格式：直接从根对象获取
-                                    name = goods_data.get('name', '未知商品')
-                                    product_name = name  # 保存产品名称
-                                    description = goods_data.get('description', '无描述')
-                                    price = str(goods_data.get('price', '未知价格'))  # 保存价格信息
-                                    selling_points = goods_data.get('product_selling_points', '').strip()
-                                    formula_source = goods_data.get('formula_source', '').strip()
-                                    
-                                    goods_parts = [name, description, f"价格:{price}元"]
-                                    if selling_points:
-                                        goods_parts.append(f"卖点:{selling_points}")
-                                    if formula_source:
-                                        goods_parts.append(f"配方:{formula_source}")
-                                    
-                                    goods_info = "-".join(goods_parts)
-                            except Exception as e:
-                                print(f"商品信息解析异常: {e}")
-                                goods_info = recommended_products
-                        
-                        # 使用文案重写大师重写文案
-                        print(f"📝 准备重写文案: {original_content}")
-                        print(f"👤 重写参数 - 人设: {self.persona_detail[:100]}...")
-                        print(f"🎬 重写参数 - 场景: {scenario}")
-                        print(f"🛍️ 重写参数 - 商品信息: {goods_info[:200]}..." if goods_info else "🛍️ 重写参数 - 商品信息: 无")
-                        
-                        rewrite_result = self.content_rewriter.process({
-                            "persona": self.persona_detail,
-                            "scenario": scenario,
-                            "query": original_content,
-                            "goods": goods_info if goods_info else None,
-                            "formula_source": formula_source,
-                            "product_selling_points": selling_points,
-                        })
-                        
-                        if rewrite_result.success:
-                            print(f"✅ 文案重写成功!")
-                            print(f"📝 重写后文案内容: {rewrite_result.content}")
-                            print(f"📊 文案长度变化: {len(original_content)} → {len(rewrite_result.content)}")
-                            
-                            # 使用重写后的文案
-                            content_result = rewrite_result
-                            
-                            print(f"📋 文案重写成功，将在后续统一记录完整数据")
-                        else:
-                            print(f"❌ 文案重写失败: {rewrite_result.error_message}")
-                            print(f"🔄 使用原始文案继续流程")
-                            
-                            print(f"📋 重写失败，使用原始文案，将在后续统一记录完整数据")
-                    else:
-                        print(f"\n商品推荐失败: {product_result.error_message}")
-                        product_error = product_result.error_message
-                        
-                        # 商品推荐失败，仍然尝试重写文案（不传入商品信息）
-                        print(f"🔄 商品推荐失败，但仍进行文案重写处理")
+        recommended_products = ""
+        product_success = False
+        product_error = ""
+        # 初始化商品相关变量，确保在所有情况下都有定义
+        product_recommendation_reason = ""
+        k3_code = ""
+        
+        if product_result.success:
+            print(f"\n{tag} 商品推荐成功: {product_result.content}")
+            recommended_products = strip_code_fence(product_result.content)
+            
+            # 解析JSON数据
+            try:
+                product_data = json.loads(recommended_products)
+                # 提取商品信息和推荐原因
+                reason = product_data.get('reason', '')
+                
+                # 支持两种数据结构：goods_list（数组）或 goods（单个对象）
+                # 由于现在只推荐单个商品，优先处理 goods 单个对象格式
+                if 'goods' in product_data:
+                    # 新格式：goods 单个对象
+                    goods_obj = product_data.get('goods')
+                    if goods_obj and isinstance(goods_obj, dict):
+                        # 提取K3编码
+                        k3_code = goods_obj.get('k3_code', '')
+                elif 'goods_list' in product_data:
+                    # 旧格式：goods_list 数组，取第一个商品
+                    goods_list = product_data.get('goods_list', [])
+                    if goods_list and len(goods_list) > 0:
+                        first_good = goods_list[0]
+                        if isinstance(first_good, dict):
+                            k3_code = first_good.get('k3_code', '')
+                
+                product_recommendation_reason = reason
+                
+                # 将解析后的JSON数据格式化存储
+                recommended_products = json.dumps(product_data, ensure_ascii=False, indent=2)
+                print(f"{tag} 解析商品推荐JSON: {product_data}")
+                print(f"{tag} K3编码: {k3_code}")
+                print(f"{tag} 推荐原因: {product_recommendation_reason}")
+            except json.JSONDecodeError as e:
+                print(f"{tag} JSON解析失败: {e}, 原始数据: {recommended_products}")
+                # 如果解析失败，保持原始字符串
+                product_recommendation_reason = "JSON解析失败"
+                k3_code = ""
+            
+            product_success = True
+            
+            # 商品推荐成功后，进行文案重写处理
+            print(f"{tag} 🔄 开始文案重写处理（基于推荐商品优化文案）")
+            
+            # 保存原始文案
+            original_content = content_result.content
+            original_len = len(original_content)
+            
+            # 准备商品信息用于重写
+            goods_info = ""
+            selling_points = ""
+            formula_source = ""
+            product_name = ""  # 添加产品名称变量
+            price = ""  # 添加价格变量
+            if recommended_products and recommended_products != "无推荐商品" and product_recommendation_reason != "JSON解析失败":
+                try:
+                    goods_data = json.loads(recommended_products)
+                    # 处理单个商品，从goods对象中提取信息
+                    if isinstance(goods_data, dict) and 'goods' in goods_data:
+                        goods_obj = goods_data['goods']
+                        name = goods_obj.get('name', '未知商品')
+                        product_name = name  # 保存产品名称
+                        description = goods_obj.get('description', '无描述')
+                        price = str(goods_obj.get('price', '未知价格'))  # 保存价格信息
+                        # 添加新字段：产品卖点和配方出处
+                        selling_points = goods_obj.get('product_selling_points', '').strip()
+                        formula_source = goods_obj.get('formula_source', '').strip()
                         
-                        # 保存原始文案
-                        original_content = content_result.content
+                        # 构建完整的商品信息格式：名称-描述-价格-卖点-配方出处
+                        goods_parts = [name, description, f"价格:{price}元"]
+                        # if selling_points:
+                        #     goods_parts.append(f"卖点:{selling_points}")
+                        # if formula_source:
+                        #     goods_parts.append(f"配方:{formula_source}")
                         
-                        # 使用文案重写大师重写文案（不传入商品信息）
-                        print(f"📝 准备重写文案: {original_content}")
-                        print(f"👤 重写参数 - 人设: {self.persona_detail[:100]}...")
-                        print(f"🎬 重写参数 - 场景: {scenario}")
+                        goods_info = "-".join(goods_parts)  # 单个商品信息
+                    elif isinstance(goods_data, dict):
+                        # 兼容旧格式：直接从根对象获取
+                        name = goods_data.get('name', '未知商品')
+                        product_name = name  # 保存产品名称
+                        description = goods_data.get('description', '无描述')
+                        price = str(goods_data.get('price', '未知价格'))  # 保存价格信息
+                        selling_points = goods_data.get('product_selling_points', '').strip()
+                        formula_source = goods_data.get('formula_source', '').strip()
                         
-                        rewrite_result = self.content_rewriter.process({
-                            "persona": self.persona_detail,
-                            "scenario": scenario,
-                            "query": original_content
-                        })
+                        goods_parts = [name, description, f"价格:{price}元"]
+                        if selling_points:
+                            goods_parts.append(f"卖点:{selling_points}")
+                        if formula_source:
+                            goods_parts.append(f"配方:{formula_source}")
                         
-                        if rewrite_result.success:
-                            print(f"✅ 文案重写成功!")
-                            print(f"📝 重写后文案内容: {rewrite_result.content}")
-                            print(f"📊 文案长度变化: {len(original_content)} → {len(rewrite_result.content)}")
-                            
-                            # 使用重写后的文案
-                            content_result = rewrite_result
-                            
-                            print(f"📋 文案重写成功，将在后续统一记录完整数据")
-                        else:
-                            print(f"❌ 文案重写失败: {rewrite_result.error_message}")
-                            print(f"🔄 使用原始文案继续流程")
-                            
-                            print(f"📋 重写失败，使用原始文案，将在后续统一记录完整数据")
-                    
-                    # 收集完整的文案数据
-                    # 构建content_data，如果进行了重写，需要保存原始内容和重写标记
-                    content_data = {"content": content_result.content}
-                    
-                    # 检查是否进行了重写（通过比较original_content变量是否存在且不同）
-                    if 'original_content' in locals() and original_content != content_result.content:
-                        content_data.update({
-                            "rewritten": True,
-                            "original_content": original_content,
-                            "rewrite_reason": "强制重写处理"
-                        })
-                        print(f"📋 记录重写信息: 原始长度={len(original_content)}, 重写后长度={len(content_result.content)}")
-                    
-                    
-                    self.content_collector.add_content(
-                        user_input=user_input,
-                        persona_detail=self.persona_detail,
-                        scenario_data={"content": scenario},
-                        scenario_validation_result=True,
-                        scenario_validation_reason=scenario_validation_reason,
-                        content_data=content_data,
-                        content_validation_data={"validation_reason": content_validation_reason},
-                        content_validation_result=True,
-                        recommended_products=recommended_products,
-                        product_recommendation_reason=product_recommendation_reason,
-                        product_recommendation_success=product_success,
-                        product_recommendation_error=product_error,
-                        k3_code=k3_code,  # 新增：传递K3编码
-                        product_name=product_name,  # 新增：传递产品名称
-                        product_selling_points=selling_points,  # 新增：传递商品卖点
-                        formula_source=formula_source,  # 新增：传递配方出处
-                        product_price=price,  # 新增：传递商品价格
-                        processing_stage="completed",
-                        final_status="success"
-                    )
-                    
+                        goods_info = "-".join(goods_parts)
                 except Exception as e:
-                    # 处理过程中的异常
-                    print(f"处理场景时发生异常: {str(e)}")
-                    self.content_collector.add_scenario_only(
-                        user_input=user_input,
-                        persona_detail=self.persona_detail,
-                        scenario=scenario,
-                        scenario_validation_result=False,
-                        scenario_validation_reason=f"处理异常: {str(e)}"
-                    )
-
-
-         
-            # 整合所有结果
-            workflow_data = {
+                    print(f"{tag} 商品信息解析异常: {e}")
+                    goods_info = recommended_products
+            
+            # 使用文案重写大师重写文案
+            print(f"{tag} 📝 准备重写文案: {original_content}")
+            print(f"{tag} 👤 重写参数 - 人设: {self._persona_preview}...")
+            print(f"{tag} 🎬 重写参数 - 场景: {scenario}")
+            print(f"{tag} 🛍️ 重写参数 - 商品信息: {goods_info[:200]}..." if goods_info else f"{tag} 🛍️ 重写参数 - 商品信息: 无")
+            
+            rewrite_result = self._call_agent(self.content_rewriter.process, {
                 "persona": self.persona_detail,
-                "content_count": self.content_collector.get_count(),
-                "message": "文案收集完成"
-            }
+                "scenario": scenario,
+                "query": original_content,
+                "goods": goods_info if goods_info else None,
+                "formula_source": formula_source,
+                "product_selling_points": selling_points,
+            })
             
-            logger.info("完整工作流执行成功")
-            return WorkflowResult(True, workflow_data)
+            if rewrite_result.success:
+                print(f"{tag} ✅ 文案重写成功!")
+                print(f"{tag} 📝 重写后文案内容: {rewrite_result.content}")
+                rewrite_len = len(rewrite_result.content)
+                print(f"{tag} 📊 文案长度变化: {original_len} → {rewrite_len}")
+                
+                # 使用重写后的文案
+                content_result = rewrite_result
+                
+                print(f"{tag} 📋 文案重写成功，将在后续统一记录完整数据")
+            else:
+                print(f"{tag} ❌ 文案重写失败: {rewrite_result.error_message}")
+                print(f"{tag} 🔄 使用原始文案继续流程")
+                
+                print(f"{tag} 📋 重写失败，使用原始文案，将在后续统一记录完整数据")
+        else:
+            print(f"\n{tag} 商品推荐失败: {product_result.error_message}")
+            product_error = product_result.error_message
             
-        except Exception as e:
-            logger.error(f"工作流执行异常: {str(e)}")
-            return WorkflowResult(False, {}, str(e))
-    
-
+            # 商品推荐失败，仍然尝试重写文案（不传入商品信息）
+            print(f"{tag} 🔄 商品推荐失败，但仍进行文案重写处理")
+            
+            # 保存原始文案
+            original_content = content_result.content
+            original_len = len(original_content)
+            
+            # 使用文案重写大师重写文案（不传入商品信息）
+            print(f"{tag} 📝 准备重写文案: {original_content}")
+            print(f"{tag} 👤 重写参数 - 人设: {self._persona_preview}...")
+            print(f"{tag} 🎬 重写参数 - 场景: {scenario}")
+            
+            rewrite_result = self._call_agent(self.content_rewriter.process, {
+                "persona": self.persona_detail,
+                "scenario": scenario,
+                "query": original_content
+            })
+            
+            if rewrite_result.success:
+                print(f"{tag} ✅ 文案重写成功!")
+                print(f"{tag} 📝 重写后文案内容: {rewrite_result.content}")
+                rewrite_len = len(rewrite_result.content)
+                print(f"{tag} 📊 文案长度变化: {original_len} → {rewrite_len}")
+                
+                # 使用重写后的文案
+                content_result = rewrite_result
+                
+                print(f"{tag} 📋 文案重写成功，将在后续统一记录完整数据")
+            else:
+                print(f"{tag} ❌ 文案重写失败: {rewrite_result.error_message}")
+                print(f"{tag} 🔄 使用原始文案继续流程")
+                
+                print(f"{tag} 📋 重写失败，使用原始文案，将在后续统一记录完整数据")
+        
+        return {
+            "content_result": content_result,
+            "original_content": original_content,
+            "original_len": original_len,
+            "rewrite_len": rewrite_len,
+            "recommended_products": recommended_products,
+            "product_success": product_success,
+            "product_error": product_error,
+            "product_recommendation_reason": product_recommendation_reason,
+            "k3_code": k3_code,
+            "product_name": product_name,
+            "selling_points": selling_points,
+            "formula_source": formula_source,
+            "price": price,
+        }
     
     def export_content_to_excel(self, filename: str = None) -> Optional[str]:
         """导出收集的文案数据到Excel
@@ -548,10 +669,10 @@ class WellnessWorkflow:
         try:
             excel_file = self.content_collector.export_to_excel(filename)
             if excel_file:
-                logger.info(f"文案数据已导出到: {excel_file}")
+                logger.info("文案数据已导出到: %s", excel_file)
             return excel_file
         except Exception as e:
-            logger.error(f"导出文案数据失败: {str(e)}")
+            logger.error("导出文案数据失败: %s", e)
             return None
     
     def get_collected_content_count(self) -> int:
@@ -568,7 +689,7 @@ class WellnessWorkflow:
         Returns:
             int: 验收通过的数据数量
         """
-        return len(self.content_collector.get_valid_items())
+        return self.content_collector.count_valid_items()
     
     def clear_collected_content(self) -> None:
         """清空已收集的文案数据"""
@@ -587,7 +708,7 @@ class WellnessWorkflow:
             if product:
                 product_dict = product.to_dict()
                 # 获取图片信息
-                image_info = self.product_db.get_product_image(product.id)
+                image_info = self.product_db.get_product_image_info(product.product_id)
                 if image_info:
                     product_dict['image'] = image_info
                 return product_dict
@@ -595,7 +716,7 @@ class WellnessWorkflow:
             return {}
             
         except Exception as e:
-            logger.error(f"获取商品信息失败: {str(e)}")
+            logger.error("获取商品信息失败: %s", e)
             return {}
     
     def run_scenario_generation(self, user_input: str) -> WorkflowResult:
@@ -617,7 +738,7 @@ class WellnessWorkflow:
             return WorkflowResult(True, scenario_validation.data)
             
         except Exception as e:
-            logger.error(f"场景生成流程异常: {str(e)}")
+            logger.error("场景生成流程异常: %s", e)
             return WorkflowResult(False, {}, str(e))
     
     def run_content_generation(self, scenario_data: Dict[str, Any]) -> WorkflowResult:
@@ -635,7 +756,7 @@ class WellnessWorkflow:
             return WorkflowResult(True, content_validation.data)
             
         except Exception as e:
-            logger.error(f"文案生成流程异常: {str(e)}")
+            logger.error("文案生成流程异常: %s", e)
             return WorkflowResult(False, {}, str(e))
     
     def run_product_recommendation(self, content_data: Dict[str, Any]) -> WorkflowResult:
@@ -653,7 +774,7 @@ class WellnessWorkflow:
             return WorkflowResult(True, product_validation.data)
             
         except Exception as e:
-            logger.error(f"商品推荐流程异常: {str(e)}")
+            logger.error("商品推荐流程异常: %s", e)
             return WorkflowResult(False, {}, str(e))
 
 # 使用示例
@@ -669,22 +790,21 @@ if __name__ == "__main__":
         agent_type=AgentType.CUSTOM
     )
     
-    # 创建工作流
-    workflow = WellnessWorkflow(config, persona_detail, product_k3_code)
-    
-    
-    # 运行完整工作流
-    result = workflow.run_complete_workflow("")
-    
-    if result.success:
-        print("工作流执行成功!")
-        print(json.dumps(result.data, ensure_ascii=False, indent=2))
+    # 创建工作流（退出时关闭推测执行线程池）
+    with WellnessWorkflow(config, persona_detail, product_k3_code) as workflow:
         
-        # 导出收集的文案数据到Excel
-        excel_file = workflow.export_content_to_excel()
-        if excel_file:
-            print(f"文案数据已导出到: {excel_file}")
+        # 运行完整工作流
+        result = workflow.run_complete_workflow("")
+        
+        if result.success:
+            print("工作流执行成功!")
+            print(json.dumps(result.data, ensure_ascii=False, indent=2))
+            
+            # 导出收集的文案数据到Excel
+            excel_file = workflow.export_content_to_excel()
+            if excel_file:
+                print(f"文案数据已导出到: {excel_file}")
+            else:
+                print("没有文案数据需要导出")
         else:
-            print("没有文案数据需要导出")
-    else:
-        print(f"工作流执行失败: {result.error}")
\ No newline at end of file
+            print(f"工作流执行失败: {result.error}")
\ No newline at end of file